@@ -25,6 +25,10 @@ def create_app(config_name: str = None) -> Flask:
     config_class = get_config(config_name)
     app.config.from_object(config_class)
 
+    from app.core.serialization import init_json
+
+    init_json(app)
+
     # Initialise extensions
     from app.extensions import cache, cors, db, migrate
 
@@ -38,6 +42,10 @@ def create_app(config_name: str = None) -> Flask:
 
     app.register_blueprint(api_bp)
 
+    from app.cli import register_commands
+
+    register_commands(app)
+
     # Create tables & seed default assets
     with app.app_context():
         try:
@@ -94,8 +102,11 @@ def _seed_default_assets() -> None:
     ]
 
     try:
+        existing = Asset.resolve(
+            db.session, [c[0] for c in crypto] + [s[0] for s in stocks]
+        )
         for symbol, name in crypto:
-            if not Asset.query.filter_by(symbol=symbol).first():
+            if symbol not in existing:
                 db.session.add(
                     Asset(
                         symbol=symbol,
@@ -106,7 +117,7 @@ def _seed_default_assets() -> None:
                     )
                 )
         for symbol, name, exchange in stocks:
-            if not Asset.query.filter_by(symbol=symbol).first():
+            if symbol not in existing:
                 db.session.add(
                     Asset(
                         symbol=symbol,
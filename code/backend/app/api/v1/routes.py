@@ -383,7 +383,7 @@ def get_watchlists(current_user: Any) -> Tuple[Response, int]:
         data = [
             {
                 **w.to_dict(),
-                "items_count": w.items.count(),
+                "items_count": len(w.items),
             }
             for w in watchlists
         ]
@@ -0,0 +1,51 @@
+"""
+Maintenance commands (``flask <command>``), run on a schedule by the
+deployment's CronJobs.
+"""
+
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask) -> None:
+    """Attach the maintenance commands to *app*'s CLI."""
+
+    @app.cli.command("refresh-valuations")
+    def refresh_valuations() -> None:
+        """Mark every active portfolio to the latest closes."""
+        from app.services.portfolio import PortfolioService
+
+        result = PortfolioService.refresh_valuations()
+        if not result["success"]:
+            raise click.ClickException(result["error"])
+        click.echo(f"Refreshed {result['refreshed']} portfolio(s)")
+
+    @app.cli.command("rebuild-latest-prices")
+    def rebuild_latest_prices() -> None:
+        """Re-seed asset_latest_prices from price_data."""
+        from app.extensions import db
+        from app.models.financial import AssetLatestPrice
+
+        AssetLatestPrice.rebuild(db.session)
+        db.session.commit()
+        click.echo("Rebuilt latest prices")
+
+    @app.cli.command("roll-partitions")
+    @click.option("--months-ahead", default=3, show_default=True)
+    @click.option(
+        "--months-back",
+        default=0,
+        show_default=True,
+        help="Also create this many past months, e.g. before a backfill.",
+    )
+    def roll_partitions(months_ahead: int, months_back: int) -> None:
+        """Create the upcoming monthly partitions ahead of the data.
+
+        Rows already in a DEFAULT partition are moved into their own months.
+        """
+        from app.extensions import db
+        from app.models.base import roll_monthly_partitions
+
+        with db.engine.begin() as connection:
+            rolled = roll_monthly_partitions(connection, months_ahead, months_back)
+        click.echo(f"Rolled partitions for {len(rolled)} table(s)")
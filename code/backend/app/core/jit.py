@@ -0,0 +1,27 @@
+"""
+numba compilation for the numeric kernels in ``app.services``.
+
+A kernel is written as a plain scalar loop that numba compiles into a single
+pass; the services keep an equivalent NumPy version for interpreters where
+numba cannot be imported.
+"""
+
+import os
+import tempfile
+from typing import Callable, Optional
+
+# The in-tree __pycache__ is read-only in the container image; keep the
+# on-disk compilation cache somewhere writable unless told otherwise.
+os.environ.setdefault(
+    "NUMBA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "numba_cache")
+)
+
+try:  # pinned in requirements.txt; NumPy versions cover its absence
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+
+def compiled(loop: Callable, fallback: Optional[Callable] = None) -> Optional[Callable]:
+    """*loop* compiled with numba, or *fallback* when numba is unavailable."""
+    return njit(cache=True)(loop) if njit is not None else fallback
@@ -97,7 +97,7 @@ class AuthenticationService:
     def generate_jwt_token(user: User, expires_in: int = 3600) -> str:
         payload = {
             "user_id": str(user.id),
-            "role": user.role.value,
+            "role": UserRole(user.role).value,
             "exp": datetime.now(timezone.utc) + timedelta(seconds=expires_in),
             "iat": datetime.now(timezone.utc),
         }
@@ -0,0 +1,47 @@
+"""
+JSON serialization for API responses: orjson when installed, stdlib otherwise.
+"""
+
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:  # orjson is optional; Flask's stdlib provider is used without it
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Output matches ``DefaultJSONProvider``: keys are sorted when
+    ``sort_keys`` is set, datetimes are passed through to Flask's HTTP-date
+    ``default`` and Decimal/dataclass values go through the same hook. UUIDs,
+    enums and numpy arrays/scalars are encoded natively.
+    """
+
+    _BASE_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_SERIALIZE_NUMPY
+        | orjson.OPT_NON_STR_KEYS
+        if orjson
+        else 0
+    )
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = self._BASE_OPTIONS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def init_json(app: Any) -> None:
+    """Install the orjson provider on *app* if orjson is importable."""
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
@@ -4,6 +4,7 @@ from app.extensions import db
 from app.models.financial import (
     Alert,
     Asset,
+    AssetLatestPrice,
     AssetType,
     AuditLog,
     ComplianceCheck,
@@ -28,6 +29,7 @@ __all__ = [
     "Alert",
     "AuditLog",
     "Asset",
+    "AssetLatestPrice",
     "AssetType",
     "ComplianceCheck",
     "ComplianceStatus",
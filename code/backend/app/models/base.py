@@ -1,12 +1,35 @@
-"""Shared model helpers: UUID column type, default factories, JSON type."""
+"""Shared model helpers: UUID column type, default factories, JSON type, partitions."""
 
 import os
+import re
+import time
 import uuid
+import zlib
+from datetime import datetime, timezone
+from typing import Dict
+
+from sqlalchemy import DDL, Column, Index, event, text
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
 USE_POSTGRES = DATABASE_URL.startswith("postgresql") or DATABASE_URL.startswith(
     "postgres"
 )
+_TIMESCALEDB_FLAG = os.environ.get("USE_TIMESCALEDB", "").lower()
+USE_TIMESCALEDB = USE_POSTGRES and _TIMESCALEDB_FLAG in ("1", "true", "yes")
+
+
+def _uuid7() -> uuid.UUID:
+    """RFC 9562 UUIDv7: 48-bit Unix-ms timestamp then 74 random bits.
+
+    Keys issued later sort later, so appends land on the right edge of the
+    primary-key B-tree instead of scattering across it.
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), "big") & ((1 << 80) - 1)
+    value &= ~(0xF << 76) & ~(0x3 << 62)
+    value |= (0x7 << 76) | (0x2 << 62)  # version 7, RFC 4122 variant
+    return uuid.UUID(int=value)
+
 
 if USE_POSTGRES:  # pragma: no cover
     from sqlalchemy.dialects.postgresql import JSONB
@@ -20,6 +43,9 @@ if USE_POSTGRES:  # pragma: no cover
     def new_uuid():
         return uuid.uuid4()
 
+    def new_uuid7():
+        return _uuid7()
+
 else:
     from sqlalchemy import JSON, String  # noqa: F401
 
@@ -32,3 +58,320 @@ else:
 
     def new_uuid():
         return str(uuid.uuid4())
+
+    def new_uuid7():
+        return str(_uuid7())
+
+
+def uuid_pk(**kwargs) -> Column:
+    """UUID primary key column.
+
+    On PostgreSQL the id comes from ``gen_random_uuid()`` so inserts carry no
+    id parameter; elsewhere it is generated in Python by ``new_uuid``. Pass
+    ``default=new_uuid7`` for append-heavy tables to get time-ordered keys.
+    """
+    if USE_POSTGRES:  # pragma: no cover
+        kwargs.setdefault("server_default", text("gen_random_uuid()"))
+    else:
+        kwargs.setdefault("default", new_uuid)
+    return Column(uuid_col(), primary_key=True, **kwargs)
+
+
+#: ``gen_random_uuid()`` is built in from PostgreSQL 13; pgcrypto covers older.
+CREATE_PGCRYPTO = DDL("CREATE EXTENSION IF NOT EXISTS pgcrypto").execute_if(
+    dialect="postgresql"
+)
+
+
+def utcnow() -> datetime:
+    """Timezone-aware default for timestamp columns (called per row)."""
+    return datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Index helpers
+# ---------------------------------------------------------------------------
+
+
+def jsonb_containment_index(name: str, column: str) -> Index:
+    """GIN ``jsonb_path_ops`` index serving ``@>`` lookups; PostgreSQL only.
+
+    ``jsonb_path_ops`` only supports containment, which is all these documents
+    are filtered by, and is a fraction of the size of the default opclass.
+    """
+    return Index(
+        name,
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "jsonb_path_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
+def brin_index(name: str, column: str, pages_per_range: int = 32) -> Index:
+    """BRIN index for an insert-ordered column (a plain B-tree off PostgreSQL).
+
+    BRIN keeps only min/max per block range, so it stays tiny and appends
+    barely touch it while range scans still prune whole blocks.
+    """
+    return Index(
+        name,
+        column,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": pages_per_range},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Compressed binary blobs
+# ---------------------------------------------------------------------------
+
+try:  # zstandard is optional; zlib keeps blobs readable without it
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover
+    _zstd = None
+
+_BLOB_ZSTD = b"Z"
+_BLOB_ZLIB = b"D"
+
+
+def compress_blob(raw: bytes) -> bytes:
+    """Compress *raw* with zstd when available, else zlib; 1-byte codec tag."""
+    if _zstd is not None:
+        return _BLOB_ZSTD + _zstd.ZstdCompressor(level=3).compress(raw)
+    return _BLOB_ZLIB + zlib.compress(raw, 6)
+
+
+def decompress_blob(blob: bytes) -> bytes:
+    tag, body = bytes(blob[:1]), bytes(blob[1:])
+    if tag == _BLOB_ZSTD:
+        if _zstd is None:
+            raise RuntimeError("zstandard is required to read this blob")
+        return _zstd.ZstdDecompressor().decompress(body)
+    if tag == _BLOB_ZLIB:
+        return zlib.decompress(body)
+    raise ValueError(f"Unknown blob codec tag: {tag!r}")
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL storage parameters
+# ---------------------------------------------------------------------------
+
+
+def set_fillfactor(table, fillfactor: int) -> None:
+    """Leave page headroom on PostgreSQL so UPDATEs can stay HOT.
+
+    Table-level ``WITH (...)`` is not a SQLAlchemy table option, so it is
+    applied with ``ALTER TABLE`` right after ``CREATE TABLE``.
+    """
+    ddl = DDL(f"ALTER TABLE {table.name} SET (fillfactor = {int(fillfactor)})")
+    event.listen(table, "after_create", ddl.execute_if(dialect="postgresql"))
+
+
+def set_column_storage(table, column: str, storage: str) -> None:
+    """Set a column's TOAST strategy (``PLAIN``/``EXTERNAL``/``MAIN``/``EXTENDED``).
+
+    Like fillfactor this has no ``CREATE TABLE`` form in SQLAlchemy, so it is
+    applied after creation; on a partitioned table it recurses to partitions.
+    """
+    ddl = DDL(
+        f"ALTER TABLE {table.name} ALTER COLUMN {column} SET STORAGE {storage.upper()}"
+    )
+    event.listen(table, "after_create", ddl.execute_if(dialect="postgresql"))
+
+
+# ---------------------------------------------------------------------------
+# PostgreSQL range partitioning
+# ---------------------------------------------------------------------------
+
+
+def partition_by_month(column: str) -> dict:
+    """``__table_args__`` entry declaring ``PARTITION BY RANGE (column)``.
+
+    Other dialects ignore ``postgresql_*`` keyword arguments, so SQLite keeps
+    creating a plain table.
+    """
+    return {"postgresql_partition_by": f"RANGE ({column})"}
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def _month_partition(table_name: str, lower: datetime) -> str:
+    return f"{table_name}_{lower:%Y_%m}"
+
+
+def _month_bounds(lower: datetime) -> str:
+    upper = _month_start(lower.year, lower.month + 1)
+    return f"FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+
+
+def _adopt_default_rows(connection, table_name: str, column: str) -> None:
+    """Move rows stranded in DEFAULT into partitions for their own months.
+
+    A month cannot be created while DEFAULT holds rows for it, so each one is
+    built as a standalone table, filled from DEFAULT and attached. DEFAULT is
+    locked against writes until the caller commits, so no row slips in
+    between the copy and the delete.
+    """
+    default = f"{table_name}_default"
+    connection.execute(text(f"LOCK TABLE {default} IN SHARE ROW EXCLUSIVE MODE"))
+    months = connection.execute(
+        text(
+            f"SELECT DISTINCT date_trunc('month', \"{column}\" AT TIME ZONE 'UTC') "
+            f"FROM {default}"
+        )
+    ).scalars()
+    for month in sorted(months):
+        lower = month.replace(tzinfo=timezone.utc)
+        upper = _month_start(lower.year, lower.month + 1)
+        partition = _month_partition(table_name, lower)
+        in_month = (
+            f"\"{column}\" >= '{lower.isoformat()}' "
+            f"AND \"{column}\" < '{upper.isoformat()}'"
+        )
+        for statement in (
+            f"CREATE TABLE {partition} (LIKE {table_name} INCLUDING DEFAULTS "
+            "INCLUDING CONSTRAINTS INCLUDING STORAGE)",
+            f"INSERT INTO {partition} SELECT * FROM {default} WHERE {in_month}",
+            f"DELETE FROM {default} WHERE {in_month}",
+            f"ALTER TABLE {table_name} ATTACH PARTITION {partition} "
+            f"FOR VALUES {_month_bounds(lower)}",
+        ):
+            connection.execute(text(statement))
+
+
+def create_monthly_partitions(
+    connection,
+    table_name: str,
+    months_back: int = 1,
+    months_ahead: int = 3,
+    column: str = None,
+) -> None:
+    """Create the DEFAULT partition plus one partition per month around now.
+
+    With *column* (the partition key), rows already sitting in DEFAULT are
+    first moved into partitions for their months, however old, so history
+    outside the window still prunes and retires per month.
+
+    Idempotent — safe to call from a periodic job to roll partitions forward.
+    Old months are retired with ``DROP TABLE <table>_YYYY_MM`` instead of a
+    bulk ``DELETE``.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+
+    now = datetime.now(timezone.utc)
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {table_name}_default "
+            f"PARTITION OF {table_name} DEFAULT"
+        )
+    )
+    if column is not None:
+        _adopt_default_rows(connection, table_name, column)
+    for offset in range(-months_back, months_ahead + 1):
+        lower = _month_start(now.year, now.month + offset)
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {_month_partition(table_name, lower)} "
+                f"PARTITION OF {table_name} FOR VALUES {_month_bounds(lower)}"
+            )
+        )
+
+
+# Tables registered for monthly partitions and their partition key columns,
+# in registration order.
+MONTHLY_PARTITIONED_TABLES: Dict[str, str] = {}
+
+
+def register_monthly_partitions(table) -> None:
+    """Create the initial partitions right after ``CREATE TABLE`` on PostgreSQL.
+
+    Later months come from ``roll_monthly_partitions``, which the
+    ``flask roll-partitions`` job runs daily. Rows outside the created months
+    land in DEFAULT until the next roll moves them into their own month.
+    """
+
+    def _after_create(target, connection, **kw):
+        create_monthly_partitions(connection, target.name)
+
+    event.listen(table, "after_create", _after_create)
+    partition_by = table.dialect_options["postgresql"]["partition_by"]
+    MONTHLY_PARTITIONED_TABLES[table.name] = re.fullmatch(
+        r"RANGE \((\w+)\)", partition_by
+    ).group(1)
+
+
+def roll_monthly_partitions(
+    connection, months_ahead: int = 3, months_back: int = 0
+) -> list:
+    """Create the upcoming months for every registered table.
+
+    Rows that landed in DEFAULT, e.g. backdated or imported history, are
+    moved into partitions for their own months first. Before a bulk backfill,
+    pass *months_back* to create the historical months up front, so the load
+    routes straight into them instead of being copied out of DEFAULT later.
+    Returns the table names rolled (empty off PostgreSQL).
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+    for table_name, column in MONTHLY_PARTITIONED_TABLES.items():
+        create_monthly_partitions(
+            connection,
+            table_name,
+            months_back=months_back,
+            months_ahead=months_ahead,
+            column=column,
+        )
+    return list(MONTHLY_PARTITIONED_TABLES)
+
+
+# ---------------------------------------------------------------------------
+# TimescaleDB hypertables
+# ---------------------------------------------------------------------------
+
+
+def time_partition_by(column: str) -> dict:
+    """``__table_args__`` entry for a time-series table.
+
+    Native monthly range partitions by default; with ``USE_TIMESCALEDB`` the
+    table is created plain and turned into a hypertable instead, since
+    TimescaleDB cannot chunk a declaratively partitioned table.
+    """
+    return {} if USE_TIMESCALEDB else partition_by_month(column)
+
+
+def register_time_partitions(
+    table,
+    column: str,
+    segment_by: str = None,
+    chunk_interval: str = "7 days",
+    compress_after: str = "7 days",
+) -> None:
+    """Partition *table* by *column*: hypertable chunks or monthly partitions.
+
+    Hypertable chunks older than *compress_after* are compressed column-wise,
+    segmented by *segment_by* so per-asset scans only decompress their rows.
+    """
+    if not USE_TIMESCALEDB:
+        register_monthly_partitions(table)
+        return
+
+    compress = [f"timescaledb.compress_orderby = '{column} DESC'"]
+    if segment_by:
+        compress.append(f"timescaledb.compress_segmentby = '{segment_by}'")
+    for statement in (
+        "CREATE EXTENSION IF NOT EXISTS timescaledb",
+        f"SELECT create_hypertable('{table.name}', '{column}', "
+        f"chunk_time_interval => INTERVAL '{chunk_interval}', "
+        "if_not_exists => TRUE)",
+        f"ALTER TABLE {table.name} SET (timescaledb.compress, {', '.join(compress)})",
+        f"SELECT add_compression_policy('{table.name}', "
+        f"INTERVAL '{compress_after}', if_not_exists => TRUE)",
+    ):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
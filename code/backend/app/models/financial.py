@@ -3,17 +3,58 @@ Database Models for QuantumVest.
 Financial-industry-grade ORM models.
 """
 
+import csv
 import enum
-from datetime import datetime, timezone
-from typing import Any, Dict
-
-from app.extensions import db
-from app.models.base import JsonType, new_uuid, uuid_col
-from sqlalchemy import CheckConstraint, Index, UniqueConstraint
+import hmac
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from hashlib import blake2b
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from app.extensions import cache, db
+from app.models.base import (
+    CREATE_PGCRYPTO,
+    JsonType,
+    brin_index,
+    compress_blob,
+    decompress_blob,
+    jsonb_containment_index,
+    new_uuid7,
+    partition_by_month,
+    register_monthly_partitions,
+    register_time_partitions,
+    set_column_storage,
+    set_fillfactor,
+    time_partition_by,
+    utcnow,
+    uuid_col,
+    uuid_pk,
+)
+from sqlalchemy import (
+    DDL,
+    CheckConstraint,
+    Index,
+    UniqueConstraint,
+    and_,
+    cast,
+    event,
+    func,
+    inspect,
+    literal_column,
+    select,
+    text,
+)
 from werkzeug.security import check_password_hash, generate_password_hash
 
 
-class UserRole(enum.Enum):
+class UserRole(str, enum.Enum):
     ADMIN = "admin"
     PORTFOLIO_MANAGER = "portfolio_manager"
     ANALYST = "analyst"
@@ -21,7 +62,7 @@ class UserRole(enum.Enum):
     VIEWER = "viewer"
 
 
-class AssetType(enum.Enum):
+class AssetType(str, enum.Enum):
     STOCK = "stock"
     CRYPTO = "crypto"
     BOND = "bond"
@@ -32,7 +73,7 @@ class AssetType(enum.Enum):
     FUTURE = "future"
 
 
-class TransactionType(enum.Enum):
+class TransactionType(str, enum.Enum):
     BUY = "buy"
     SELL = "sell"
     DIVIDEND = "dividend"
@@ -43,31 +84,277 @@ class TransactionType(enum.Enum):
     WITHDRAWAL = "withdrawal"
 
 
-class RiskLevel(enum.Enum):
+class RiskLevel(str, enum.Enum):
     CONSERVATIVE = "conservative"
     MODERATE = "moderate"
     AGGRESSIVE = "aggressive"
     SPECULATIVE = "speculative"
 
 
-class ComplianceStatus(enum.Enum):
+class ComplianceStatus(str, enum.Enum):
     COMPLIANT = "compliant"
     NON_COMPLIANT = "non_compliant"
     UNDER_REVIEW = "under_review"
     PENDING = "pending"
 
 
+# Enum columns are VARCHAR + CHECK and load as plain strings; the str mixin
+# keeps ``user.role == UserRole.ADMIN`` true either way.
+def _enum_check(column: str, enum_cls: Any, name: str) -> CheckConstraint:
+    values = ", ".join(f"'{member.value}'" for member in enum_cls)
+    return CheckConstraint(f"{column} IN ({values})", name=name)
+
+
+# member or raw value -> plain str (str-mixin members hash like their value).
+_ENUM_VALUES: Dict[enum.Enum, str] = {
+    member: member.value
+    for member in chain(
+        UserRole, AssetType, TransactionType, RiskLevel, ComplianceStatus
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Password hashing
+# ---------------------------------------------------------------------------
+
+try:  # argon2-cffi is optional; werkzeug's PBKDF2 is used without it
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+
+    _argon2 = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+except ImportError:  # pragma: no cover
+    _argon2 = None
+
+
+def _hash_password(password: str) -> str:
+    if _argon2 is not None:
+        return _argon2.hash(password)
+    return generate_password_hash(password)
+
+
+def _verify_password(password_hash: str, password: str) -> bool:
+    """Check against an argon2 hash or a legacy werkzeug PBKDF2/scrypt hash."""
+    if not password_hash.startswith("$argon2"):
+        return check_password_hash(password_hash, password)
+    if _argon2 is None:
+        return False
+    try:
+        return _argon2.verify(password_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def _needs_rehash(password_hash: str) -> bool:
+    if _argon2 is None:
+        return False
+    if not password_hash.startswith("$argon2"):
+        return True
+    return _argon2.check_needs_rehash(password_hash)
+
+
+# ---------------------------------------------------------------------------
+# Password verification cache
+# ---------------------------------------------------------------------------
+
+# Per-process key: cached digests are useless outside this interpreter.
+_PASSWORD_PEPPER = os.urandom(32)
+_PASSWORD_CACHE_TTL = 60.0
+_PASSWORD_CACHE_SIZE = 4096
+
+_password_cache: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+_password_cache_lock = threading.Lock()
+
+
+def _password_digest(password_hash: str, password: str) -> bytes:
+    # Binding the stored hash means a password change elsewhere never matches.
+    return blake2b(
+        f"{password_hash}\x00{password}".encode("utf-8"), key=_PASSWORD_PEPPER
+    ).digest()
+
+
+def _cached_password_ok(user_id: str, digest: bytes) -> bool:
+    with _password_cache_lock:
+        entry = _password_cache.get(user_id)
+        if entry is None:
+            return False
+        cached, expires_at = entry
+        if expires_at < time.monotonic():
+            del _password_cache[user_id]
+            return False
+        _password_cache.move_to_end(user_id)
+    return len(cached) == len(digest) and hmac.compare_digest(cached, digest)
+
+
+def _remember_password(user_id: str, digest: bytes) -> None:
+    with _password_cache_lock:
+        _password_cache[user_id] = (digest, time.monotonic() + _PASSWORD_CACHE_TTL)
+        _password_cache.move_to_end(user_id)
+        while len(_password_cache) > _PASSWORD_CACHE_SIZE:
+            _password_cache.popitem(last=False)
+
+
+def _forget_password(user_id: Optional[str]) -> None:
+    if user_id is None:
+        return
+    with _password_cache_lock:
+        _password_cache.pop(user_id, None)
+
+
+# ---------------------------------------------------------------------------
+# Bulk writes
+# ---------------------------------------------------------------------------
+
+_UPSERT_BATCH_SIZE = 5000
+
+
+def _row_normaliser(table: Any, skip: Sequence[str] = ()) -> Any:
+    """Return a function giving every row the same keys.
+
+    Multi-row VALUES and COPY both need one column list for the whole batch,
+    so Python-side scalar defaults and a fresh id are filled in up front and
+    other nullable columns default to None. Columns with a server default are
+    left out so the database fills them.
+    """
+    defaults = {
+        c.name: c.default.arg
+        for c in table.columns
+        if c.default is not None and c.default.is_scalar
+    }
+    id_default = table.c.id.default  # None when the database generates ids
+    nullable_columns = [
+        c.name
+        for c in table.columns
+        if c.name not in ("id", *skip) and c.server_default is None
+    ]
+
+    def _normalise(row: Dict[str, Any]) -> Dict[str, Any]:
+        full = {**defaults, **row}
+        if id_default is not None and "id" not in full:
+            full["id"] = id_default.arg(None)
+        for name in nullable_columns:
+            full.setdefault(name, None)
+        return full
+
+    return _normalise
+
+
+def _upsert_many(
+    session: Any,
+    model: Any,
+    rows: Iterable[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    batch_size: int = _UPSERT_BATCH_SIZE,
+) -> int:
+    """INSERT ... ON CONFLICT DO UPDATE in batches of *batch_size* rows."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        # SQLite caps bound parameters per statement at 32766.
+        batch_size = min(batch_size, 32_000 // len(model.__table__.columns))
+    else:
+        raise NotImplementedError(f"upsert is not supported on {dialect!r}")
+
+    table = model.__table__
+    normalise = _row_normaliser(table, skip=conflict_columns)
+
+    sent = 0
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(normalise(row))
+        if len(batch) >= batch_size:
+            sent += _execute_upsert(session, insert, table, batch, conflict_columns)
+            batch = []
+    if batch:
+        sent += _execute_upsert(session, insert, table, batch, conflict_columns)
+    return sent
+
+
+def _execute_upsert(
+    session: Any,
+    insert: Any,
+    table: Any,
+    batch: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+) -> int:
+    stmt = insert(table).values(batch)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={
+            c.name: stmt.excluded[c.name]
+            for c in table.columns
+            if c.name not in ("id", *conflict_columns)
+        },
+    )
+    session.execute(stmt)
+    return len(batch)
+
+
+def _bulk_load(session: Any, model: Any, rows: Iterable[Dict[str, Any]]) -> int:
+    """Append new rows in one round trip: COPY on psycopg2, executemany otherwise."""
+    table = model.__table__
+    normalise = _row_normaliser(table)
+    batch = [normalise(row) for row in rows]
+    if not batch:
+        return 0
+
+    connection = session.connection()
+    if connection.dialect.driver == "psycopg2":
+        columns = list(batch[0])
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in batch:
+            writer.writerow(
+                [
+                    value.isoformat() if isinstance(value, datetime) else value
+                    for value in (row[c] for c in columns)
+                ]
+            )
+        buf.seek(0)
+        # Runs on the session's own DBAPI connection, inside its transaction.
+        cursor = connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buf,
+            )
+        finally:
+            cursor.close()
+    else:
+        session.execute(table.insert(), batch)
+    return len(batch)
+
+
+class _BulkLoadMixin:
+    """``bulk_load`` for append-only time-series tables."""
+
+    @classmethod
+    def bulk_load(cls, session: Any, rows: Iterable[Dict[str, Any]]) -> int:
+        """Insert rows known to be new (backfills, daily closes).
+
+        Uses ``COPY FROM STDIN`` on PostgreSQL/psycopg2 and a batched
+        executemany elsewhere. Duplicates raise; use ``upsert_many`` when the
+        batch may overlap existing rows. The caller owns the transaction.
+        """
+        return _bulk_load(session, cls, rows)
+
+
 class User(db.Model):
     __tablename__ = "users"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
+    id = uuid_pk()
     email = db.Column(db.String(255), unique=True, nullable=False, index=True)
     username = db.Column(db.String(80), unique=True, nullable=False, index=True)
-    password_hash = db.Column(db.String(255), nullable=False)
+    # argon2id is ~100 chars; legacy werkzeug scrypt hashes are the longest at 162.
+    password_hash = db.Column(db.String(192), nullable=False)
     first_name = db.Column(db.String(100), nullable=True)
     last_name = db.Column(db.String(100), nullable=True)
     phone = db.Column(db.String(20))
-    role = db.Column(db.Enum(UserRole), default=UserRole.CLIENT, nullable=False)
+    role = db.Column(db.String(20), default=UserRole.CLIENT.value, nullable=False)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     is_verified = db.Column(db.Boolean, default=False, nullable=False)
     risk_tolerance = db.Column(db.Float, default=0.5)
@@ -75,36 +362,64 @@ class User(db.Model):
     annual_income = db.Column(db.Numeric(15, 2))
     net_worth = db.Column(db.Numeric(15, 2))
     investment_goals = db.Column(db.Text)
-    kyc_status = db.Column(db.Enum(ComplianceStatus), default=ComplianceStatus.PENDING)
-    aml_status = db.Column(db.Enum(ComplianceStatus), default=ComplianceStatus.PENDING)
+    kyc_status = db.Column(db.String(20), default=ComplianceStatus.PENDING.value)
+    aml_status = db.Column(db.String(20), default=ComplianceStatus.PENDING.value)
     accredited_investor = db.Column(db.Boolean, default=False)
     two_factor_enabled = db.Column(db.Boolean, default=False)
     last_login = db.Column(db.DateTime(timezone=True))
     failed_login_attempts = db.Column(db.Integer, default=0)
     account_locked_until = db.Column(db.DateTime(timezone=True))
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
     updated_at = db.Column(
         db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
     )
 
+    # Loaded on access only: every authenticated request loads the User.
     portfolios = db.relationship(
-        "Portfolio", backref="owner", lazy="dynamic", cascade="all, delete-orphan"
+        "Portfolio", back_populates="owner", cascade="all, delete-orphan"
     )
-    transactions = db.relationship("Transaction", backref="user", lazy="dynamic")
+    # Unbounded histories stay dynamic so they are always queried, never loaded.
+    transactions = db.relationship("Transaction", back_populates="user", lazy="dynamic")
     alerts = db.relationship(
-        "Alert", backref="user", lazy="dynamic", cascade="all, delete-orphan"
+        "Alert", back_populates="user", lazy="dynamic", cascade="all, delete-orphan"
+    )
+    audit_logs = db.relationship("AuditLog", back_populates="user", lazy="dynamic")
+
+    __table_args__ = (
+        _enum_check("role", UserRole, "valid_user_role"),
+        _enum_check("kyc_status", ComplianceStatus, "valid_kyc_status"),
+        _enum_check("aml_status", ComplianceStatus, "valid_aml_status"),
     )
-    audit_logs = db.relationship("AuditLog", backref="user", lazy="dynamic")
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        _forget_password(str(self.id) if self.id is not None else None)
+        self.password_hash = _hash_password(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        """Verify *password*, skipping the KDF for repeat successes within 60s.
+
+        Legacy werkzeug hashes are upgraded to argon2 on the first successful
+        check; the caller's commit persists the new hash.
+        """
+        if not self.password_hash:
+            return False
+        user_id = str(self.id) if self.id is not None else None
+        digest = _password_digest(self.password_hash, password)
+        if user_id is not None and _cached_password_ok(user_id, digest):
+            return True
+        if not _verify_password(self.password_hash, password):
+            return False
+        if _needs_rehash(self.password_hash):
+            self.password_hash = _hash_password(password)
+            digest = _password_digest(self.password_hash, password)
+        if user_id is not None:
+            _remember_password(user_id, digest)
+        return True
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -113,31 +428,35 @@ class User(db.Model):
             "username": self.username,
             "first_name": self.first_name,
             "last_name": self.last_name,
-            "role": self.role.value,
+            "role": _ENUM_VALUES[self.role],
             "is_active": self.is_active,
             "is_verified": self.is_verified,
             "risk_tolerance": (
                 float(self.risk_tolerance) if self.risk_tolerance is not None else None
             ),
             "investment_experience": self.investment_experience,
-            "kyc_status": self.kyc_status.value,
-            "aml_status": self.aml_status.value,
+            "kyc_status": _ENUM_VALUES[self.kyc_status],
+            "aml_status": _ENUM_VALUES[self.aml_status],
             "two_factor_enabled": self.two_factor_enabled,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
 
 
+_ASSET_ID_KEY = "asset_id:{}"
+_ASSET_ID_CACHE_TIMEOUT = 3600
+
+
 class Asset(db.Model):
     __tablename__ = "assets"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
+    id = uuid_pk()
     symbol = db.Column(db.String(20), unique=True, nullable=False, index=True)
     name = db.Column(db.String(255), nullable=False)
-    asset_type = db.Column(db.Enum(AssetType), nullable=False, index=True)
+    asset_type = db.Column(db.String(20), nullable=False, index=True)
     exchange = db.Column(db.String(50))
     sector = db.Column(db.String(100))
     industry = db.Column(db.String(100))
-    market_cap = db.Column(db.Numeric(20, 2))
+    market_cap = db.Column(db.Float)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     is_tradeable = db.Column(db.Boolean, default=True, nullable=False)
     min_trade_amount = db.Column(db.Numeric(15, 8), default=0.001)
@@ -148,31 +467,76 @@ class Asset(db.Model):
     website = db.Column(db.String(255))
     meta_data = db.Column(JsonType)
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
     updated_at = db.Column(
         db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+    )
+
+    __table_args__ = (
+        _enum_check("asset_type", AssetType, "valid_asset_type"),
+        jsonb_containment_index("idx_asset_meta_gin", "meta_data"),
     )
 
     price_history = db.relationship(
-        "PriceHistory", backref="asset", lazy="dynamic", cascade="all, delete-orphan"
+        "PriceHistory",
+        back_populates="asset",
+        lazy="dynamic",
+        cascade="all, delete-orphan",
     )
     price_data = db.relationship(
-        "PriceData", backref="asset", lazy="dynamic", cascade="all, delete-orphan"
+        "PriceData",
+        back_populates="asset",
+        lazy="dynamic",
+        cascade="all, delete-orphan",
     )
-    portfolio_holdings = db.relationship(
-        "PortfolioHolding", backref="asset", lazy="dynamic"
+    portfolio_holdings = db.relationship("PortfolioHolding", back_populates="asset")
+    transactions = db.relationship(
+        "Transaction", back_populates="asset", lazy="dynamic"
     )
-    transactions = db.relationship("Transaction", backref="asset", lazy="dynamic")
+
+    @classmethod
+    def fetch_by_symbols(cls, symbols: Iterable[str]) -> Dict[str, "Asset"]:
+        """Load many assets with one ``IN`` query, keyed by symbol."""
+        wanted = list(dict.fromkeys(symbols))
+        if not wanted:
+            return {}
+        return {a.symbol: a for a in cls.query.filter(cls.symbol.in_(wanted)).all()}
+
+    @classmethod
+    def resolve(cls, session: Any, symbols: Iterable[str]) -> Dict[str, Any]:
+        """Map symbols to asset ids: cache first, one ``IN`` query for the rest.
+
+        Unknown symbols are absent from the result.
+        """
+        wanted = list(dict.fromkeys(symbols))
+        if not wanted:
+            return {}
+        cached = cache.get_many(*(_ASSET_ID_KEY.format(s) for s in wanted))
+        found = {s: i for s, i in zip(wanted, cached) if i is not None}
+        missing = [s for s in wanted if s not in found]
+        if missing:
+            rows = session.execute(
+                select(cls.symbol, cls.id).where(cls.symbol.in_(missing))
+            ).all()
+            fetched = {symbol: asset_id for symbol, asset_id in rows}
+            if fetched:
+                cache.set_many(
+                    {_ASSET_ID_KEY.format(s): i for s, i in fetched.items()},
+                    timeout=_ASSET_ID_CACHE_TIMEOUT,
+                )
+            found.update(fetched)
+        return found
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": str(self.id),
             "symbol": self.symbol,
             "name": self.name,
-            "asset_type": self.asset_type.value,
+            "asset_type": _ENUM_VALUES[self.asset_type],
             "exchange": self.exchange,
             "sector": self.sector,
             "industry": self.industry,
@@ -185,10 +549,18 @@ class Asset(db.Model):
         }
 
 
+@event.listens_for(Asset, "after_update")
+@event.listens_for(Asset, "after_delete")
+def _evict_asset_id(_mapper: Any, _connection: Any, target: Asset) -> None:
+    # Covers the old symbol too when a symbol is renamed.
+    symbols = {target.symbol, *inspect(target).attrs.symbol.history.deleted}
+    cache.delete_many(*(_ASSET_ID_KEY.format(s) for s in symbols if s))
+
+
 class Portfolio(db.Model):
     __tablename__ = "portfolios"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
+    id = uuid_pk()
     user_id = db.Column(
         uuid_col(), db.ForeignKey("users.id"), nullable=False, index=True
     )
@@ -196,13 +568,13 @@ class Portfolio(db.Model):
     description = db.Column(db.Text)
     currency = db.Column(db.String(10), default="USD")
     is_default = db.Column(db.Boolean, default=False, nullable=False)
-    risk_level = db.Column(db.Enum(RiskLevel), default=RiskLevel.MODERATE)
+    risk_level = db.Column(db.String(20), default=RiskLevel.MODERATE.value)
     target_return = db.Column(db.Float)
     benchmark_symbol = db.Column(db.String(20))
-    total_value = db.Column(db.Numeric(20, 2), default=0)
+    total_value = db.Column(db.Float, default=0)
     cash_balance = db.Column(db.Numeric(20, 2), default=0)
     invested_amount = db.Column(db.Numeric(20, 2), default=0)
-    unrealized_pnl = db.Column(db.Numeric(20, 2), default=0)
+    unrealized_pnl = db.Column(db.Float, default=0)
     realized_pnl = db.Column(db.Numeric(20, 2), default=0)
     total_return = db.Column(db.Float, default=0)
     annualized_return = db.Column(db.Float)
@@ -215,28 +587,57 @@ class Portfolio(db.Model):
     auto_rebalance = db.Column(db.Boolean, default=False)
     rebalance_threshold = db.Column(db.Float, default=0.05)
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
     updated_at = db.Column(
         db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
+    )
+
+    __table_args__ = (
+        # Narrower companion to the user_id index for the active-portfolio
+        # listing; ownership checks and the users FK still use the full one.
+        Index(
+            "idx_portfolio_user_active",
+            "user_id",
+            postgresql_where=text("is_active"),
+        ),
+        _enum_check("risk_level", RiskLevel, "valid_risk_level"),
     )
 
+    owner = db.relationship("User", back_populates="portfolios")
+    # Loaded on access; callers that iterate holdings ask for selectinload.
     holdings = db.relationship(
-        "PortfolioHolding",
-        backref="portfolio",
-        lazy="dynamic",
-        cascade="all, delete-orphan",
+        "PortfolioHolding", back_populates="portfolio", cascade="all, delete-orphan"
+    )
+    transactions = db.relationship(
+        "Transaction", back_populates="portfolio", lazy="dynamic"
     )
-    transactions = db.relationship("Transaction", backref="portfolio", lazy="dynamic")
     performance_history = db.relationship(
         "PortfolioPerformance",
-        backref="portfolio",
+        back_populates="portfolio",
         lazy="dynamic",
         cascade="all, delete-orphan",
     )
 
+    @classmethod
+    def refresh_valuation(cls, session: Any, portfolio_id: Any) -> None:
+        """Mark every holding to its latest close and re-total the portfolio.
+
+        Set-based UPDATEs instead of one price lookup per holding. Holdings
+        without any price data keep their previous valuation. The caller owns
+        the transaction.
+        """
+        params = {"pid": portfolio_id}
+        if session.get_bind().dialect.name == "postgresql":
+            # The portfolio_holdings triggers re-total the portfolio.
+            session.execute(_REFRESH_HOLDINGS_PG, params)
+        else:
+            session.execute(_REFRESH_HOLDINGS_GENERIC, params)
+            session.execute(_REFRESH_PORTFOLIO_TOTAL, params)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": str(self.id),
@@ -245,7 +646,7 @@ class Portfolio(db.Model):
             "description": self.description,
             "currency": self.currency,
             "is_default": self.is_default,
-            "risk_level": self.risk_level.value if self.risk_level else None,
+            "risk_level": _ENUM_VALUES.get(self.risk_level),
             "total_value": float(self.total_value) if self.total_value else 0,
             "cash_balance": float(self.cash_balance) if self.cash_balance else 0,
             "invested_amount": (
@@ -262,38 +663,152 @@ class Portfolio(db.Model):
         }
 
 
+_REFRESH_HOLDINGS_PG = text(
+    """
+    UPDATE portfolio_holdings AS h
+    SET current_price = p.close_price,
+        market_value = h.quantity * p.close_price,
+        unrealized_pnl = (p.close_price - h.average_cost) * h.quantity
+    FROM (
+        SELECT h2.id, lp.close_price
+        FROM portfolio_holdings AS h2
+        CROSS JOIN LATERAL (
+            SELECT pd.close_price
+            FROM price_data AS pd
+            WHERE pd.asset_id = h2.asset_id
+            ORDER BY pd.timestamp DESC
+            LIMIT 1
+        ) AS lp
+        WHERE h2.portfolio_id = :pid
+    ) AS p
+    WHERE h.id = p.id
+    """
+)
+
+# Dialects without LATERAL (SQLite in tests) fall back to a correlated subquery.
+_REFRESH_HOLDINGS_GENERIC = text(
+    """
+    UPDATE portfolio_holdings
+    SET current_price = (
+            SELECT pd.close_price FROM price_data AS pd
+            WHERE pd.asset_id = portfolio_holdings.asset_id
+            ORDER BY pd.timestamp DESC LIMIT 1
+        ),
+        market_value = quantity * (
+            SELECT pd.close_price FROM price_data AS pd
+            WHERE pd.asset_id = portfolio_holdings.asset_id
+            ORDER BY pd.timestamp DESC LIMIT 1
+        ),
+        unrealized_pnl = quantity * ((
+            SELECT pd.close_price FROM price_data AS pd
+            WHERE pd.asset_id = portfolio_holdings.asset_id
+            ORDER BY pd.timestamp DESC LIMIT 1
+        ) - average_cost)
+    WHERE portfolio_id = :pid
+      AND EXISTS (
+          SELECT 1 FROM price_data AS pd
+          WHERE pd.asset_id = portfolio_holdings.asset_id
+      )
+    """
+)
+
+_REFRESH_PORTFOLIO_TOTAL = text(
+    """
+    UPDATE portfolios
+    SET total_value = (
+        SELECT COALESCE(SUM(h.market_value), 0)
+        FROM portfolio_holdings AS h
+        WHERE h.portfolio_id = :pid
+    )
+    WHERE id = :pid
+    """
+)
+
+# On PostgreSQL, statement-level triggers keep the portfolio roll-ups in step
+# with every write to portfolio_holdings, so the total never has to be
+# re-aggregated on read. Transition tables cannot be shared between events,
+# hence one trigger per event over a common function.
+_HOLDINGS_ROLLUP_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION portfolio_holdings_rollup() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE portfolios AS p
+        SET total_value = s.total_value,
+            unrealized_pnl = s.unrealized_pnl,
+            invested_amount = s.invested_amount
+        FROM (
+            SELECT c.portfolio_id,
+                   COALESCE(SUM(h.market_value), 0) AS total_value,
+                   COALESCE(SUM(h.unrealized_pnl), 0) AS unrealized_pnl,
+                   COALESCE(SUM(h.quantity * h.average_cost), 0) AS invested_amount
+            FROM (SELECT DISTINCT portfolio_id FROM changed) AS c
+            LEFT JOIN portfolio_holdings AS h ON h.portfolio_id = c.portfolio_id
+            GROUP BY c.portfolio_id
+        ) AS s
+        WHERE p.id = s.portfolio_id;
+        RETURN NULL;
+    END
+    $$
+    """
+)
+_HOLDINGS_ROLLUP_TRIGGERS = [
+    DDL(
+        f"CREATE TRIGGER portfolio_holdings_rollup_{event_name.lower()} "
+        f"AFTER {event_name} ON portfolio_holdings "
+        f"REFERENCING {transition} TABLE AS changed "
+        "FOR EACH STATEMENT EXECUTE FUNCTION portfolio_holdings_rollup()"
+    )
+    for event_name, transition in (
+        ("INSERT", "NEW"),
+        ("UPDATE", "NEW"),
+        ("DELETE", "OLD"),
+    )
+]
+
+
 class PortfolioHolding(db.Model):
     __tablename__ = "portfolio_holdings"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    portfolio_id = db.Column(
-        uuid_col(), db.ForeignKey("portfolios.id"), nullable=False, index=True
-    )
+    id = uuid_pk()
+    portfolio_id = db.Column(uuid_col(), db.ForeignKey("portfolios.id"), nullable=False)
     asset_id = db.Column(
         uuid_col(), db.ForeignKey("assets.id"), nullable=False, index=True
     )
     quantity = db.Column(db.Numeric(20, 8), nullable=False, default=0)
     average_cost = db.Column(db.Numeric(15, 8), nullable=False, default=0)
-    current_price = db.Column(db.Numeric(15, 8))
-    market_value = db.Column(db.Numeric(20, 2), default=0)
-    unrealized_pnl = db.Column(db.Numeric(20, 2), default=0)
+    current_price = db.Column(db.Float)
+    market_value = db.Column(db.Float, default=0)
+    unrealized_pnl = db.Column(db.Float, default=0)
     unrealized_pnl_percent = db.Column(db.Float, default=0)
     weight = db.Column(db.Float, default=0)
     target_weight = db.Column(db.Float)
     weight_deviation = db.Column(db.Float)
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
     updated_at = db.Column(
         db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
     )
 
+    portfolio = db.relationship("Portfolio", back_populates="holdings")
+    asset = db.relationship("Asset", back_populates="portfolio_holdings")
+
     __table_args__ = (
         UniqueConstraint("portfolio_id", "asset_id", name="unique_portfolio_asset"),
         CheckConstraint("quantity >= 0", name="positive_quantity"),
         CheckConstraint("average_cost >= 0", name="positive_average_cost"),
+        # Covers the holdings list for index-only scans. Price-driven columns
+        # (market_value, unrealized_pnl) stay out so revaluations remain HOT.
+        Index(
+            "idx_active_holdings",
+            "portfolio_id",
+            postgresql_where=text("quantity > 0"),
+            postgresql_include=["asset_id", "quantity", "average_cost"],
+        ),
     )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -315,17 +830,15 @@ class PortfolioHolding(db.Model):
 class Transaction(db.Model):
     __tablename__ = "transactions"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
+    id = uuid_pk()
     user_id = db.Column(
         uuid_col(), db.ForeignKey("users.id"), nullable=False, index=True
     )
-    portfolio_id = db.Column(
-        uuid_col(), db.ForeignKey("portfolios.id"), nullable=False, index=True
-    )
+    portfolio_id = db.Column(uuid_col(), db.ForeignKey("portfolios.id"), nullable=False)
     asset_id = db.Column(
         uuid_col(), db.ForeignKey("assets.id"), nullable=False, index=True
     )
-    transaction_type = db.Column(db.Enum(TransactionType), nullable=False, index=True)
+    transaction_type = db.Column(db.String(20), nullable=False)
     quantity = db.Column(db.Numeric(20, 8), nullable=False)
     price = db.Column(db.Numeric(15, 8), nullable=False)
     total_amount = db.Column(db.Numeric(20, 2), nullable=False)
@@ -336,30 +849,105 @@ class Transaction(db.Model):
     execution_venue = db.Column(db.String(100))
     notes = db.Column(db.Text)
     meta_data = db.Column(JsonType)
+    # Partition key — PostgreSQL requires it in the primary key.
     executed_at = db.Column(
         db.DateTime(timezone=True),
+        primary_key=True,
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=utcnow,
+        server_default=func.now(),
     )
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
 
+    user = db.relationship("User", back_populates="transactions")
+    portfolio = db.relationship("Portfolio", back_populates="transactions")
+    asset = db.relationship("Asset", back_populates="transactions")
+
     __table_args__ = (
         Index("idx_transaction_date", "executed_at"),
         Index("idx_transaction_type_date", "transaction_type", "executed_at"),
+        Index(
+            "idx_transaction_portfolio_date",
+            "portfolio_id",
+            "executed_at",
+            postgresql_include=[
+                "transaction_type",
+                "quantity",
+                "price",
+                "total_amount",
+            ],
+        ),
         CheckConstraint("quantity > 0", name="positive_quantity"),
         CheckConstraint("price >= 0", name="non_negative_price"),
         CheckConstraint("fees >= 0", name="non_negative_fees"),
+        _enum_check("transaction_type", TransactionType, "valid_transaction_type"),
+        jsonb_containment_index("idx_transaction_meta_gin", "meta_data"),
+        partition_by_month("executed_at"),
     )
 
+    @classmethod
+    def page_dicts(
+        cls, session: Any, portfolio_id: Any, limit: int, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Newest-first page of ``to_dict()`` rows for one portfolio.
+
+        On PostgreSQL each row arrives as one ``jsonb_build_object`` document
+        with numerics already cast to float8, so no Decimal or ORM instance is
+        built per row.
+        """
+        if session.get_bind().dialect.name != "postgresql":
+            rows = session.scalars(
+                select(cls)
+                .where(cls.portfolio_id == portfolio_id)
+                .order_by(cls.executed_at.desc())
+                .limit(limit)
+                .offset(offset)
+            )
+            return [row.to_dict() for row in rows]
+
+        def _float(column: Any, default: Any = None) -> Any:
+            value = cast(column, db.Float)
+            return value if default is None else func.coalesce(value, default)
+
+        fields = {
+            "id": cast(cls.id, db.Text),
+            "user_id": cast(cls.user_id, db.Text),
+            "portfolio_id": cast(cls.portfolio_id, db.Text),
+            "asset_id": cast(cls.asset_id, db.Text),
+            "transaction_type": cls.transaction_type,
+            "quantity": _float(cls.quantity),
+            "price": _float(cls.price),
+            "total_amount": _float(cls.total_amount),
+            "fees": _float(cls.fees, 0),
+            "realized_pnl": _float(cls.realized_pnl, 0),
+            "executed_at": cls.executed_at,
+            "notes": cls.notes,
+        }
+        # Keys are fixed identifiers, inlined so the statement has no untyped binds.
+        document = func.jsonb_build_object(
+            *chain.from_iterable(
+                (literal_column(f"'{key}'"), value) for key, value in fields.items()
+            )
+        )
+        return list(
+            session.scalars(
+                select(document)
+                .where(cls.portfolio_id == portfolio_id)
+                .order_by(cls.executed_at.desc())
+                .limit(limit)
+                .offset(offset)
+            )
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": str(self.id),
             "user_id": str(self.user_id),
             "portfolio_id": str(self.portfolio_id),
             "asset_id": str(self.asset_id),
-            "transaction_type": self.transaction_type.value,
+            "transaction_type": _ENUM_VALUES[self.transaction_type],
             "quantity": float(self.quantity),
             "price": float(self.price),
             "total_amount": float(self.total_amount),
@@ -370,76 +958,184 @@ class Transaction(db.Model):
         }
 
 
-class PriceHistory(db.Model):
+class PriceHistory(_BulkLoadMixin, db.Model):
     __tablename__ = "price_history"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    asset_id = db.Column(
-        uuid_col(), db.ForeignKey("assets.id"), nullable=False, index=True
-    )
-    timestamp = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
-    open_price = db.Column(db.Numeric(15, 8), nullable=False)
-    high_price = db.Column(db.Numeric(15, 8), nullable=False)
-    low_price = db.Column(db.Numeric(15, 8), nullable=False)
-    close_price = db.Column(db.Numeric(15, 8), nullable=False)
-    volume = db.Column(db.Numeric(20, 2))
-    price_change = db.Column(db.Numeric(15, 8))
+    id = uuid_pk(default=new_uuid7)
+    asset_id = db.Column(uuid_col(), db.ForeignKey("assets.id"), nullable=False)
+    # Partition key — PostgreSQL requires it in the primary key.
+    timestamp = db.Column(db.DateTime(timezone=True), primary_key=True, nullable=False)
+    open_price = db.Column(db.Float, nullable=False)
+    high_price = db.Column(db.Float, nullable=False)
+    low_price = db.Column(db.Float, nullable=False)
+    close_price = db.Column(db.Float, nullable=False)
+    volume = db.Column(db.Float)
+    price_change = db.Column(db.Float)
     price_change_percent = db.Column(db.Float)
     source = db.Column(db.String(50), default="api")
 
+    asset = db.relationship("Asset", back_populates="price_history")
+
     __table_args__ = (
         UniqueConstraint("asset_id", "timestamp", name="unique_asset_timestamp"),
-        Index("idx_price_history_timestamp", "timestamp"),
+        brin_index("idx_price_history_ts_brin", "timestamp"),
         CheckConstraint("open_price > 0", name="positive_open_price"),
         CheckConstraint("high_price > 0", name="positive_high_price"),
         CheckConstraint("low_price > 0", name="positive_low_price"),
         CheckConstraint("close_price > 0", name="positive_close_price"),
         CheckConstraint("volume >= 0", name="non_negative_volume"),
+        time_partition_by("timestamp"),
     )
 
+    @classmethod
+    def upsert_many(
+        cls,
+        session: Any,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = _UPSERT_BATCH_SIZE,
+    ) -> int:
+        """Insert bars, overwriting any existing (asset_id, timestamp) row.
+
+        Returns the number of rows sent. The caller owns the transaction.
+        """
+        return _upsert_many(
+            session, cls, rows, ("asset_id", "timestamp"), batch_size=batch_size
+        )
+
 
-class PriceData(db.Model):
+class PriceData(_BulkLoadMixin, db.Model):
     __tablename__ = "price_data"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    asset_id = db.Column(
-        uuid_col(), db.ForeignKey("assets.id"), nullable=False, index=True
-    )
-    timestamp = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
+    id = uuid_pk(default=new_uuid7)
+    asset_id = db.Column(uuid_col(), db.ForeignKey("assets.id"), nullable=False)
+    # Partition key — PostgreSQL requires it in the primary key.
+    timestamp = db.Column(db.DateTime(timezone=True), primary_key=True, nullable=False)
     interval = db.Column(db.String(10), nullable=False, default="1d")
-    open_price = db.Column(db.Numeric(15, 8), nullable=False)
-    high_price = db.Column(db.Numeric(15, 8), nullable=False)
-    low_price = db.Column(db.Numeric(15, 8), nullable=False)
-    close_price = db.Column(db.Numeric(15, 8), nullable=False)
-    volume = db.Column(db.Numeric(20, 2))
+    open_price = db.Column(db.Float, nullable=False)
+    high_price = db.Column(db.Float, nullable=False)
+    low_price = db.Column(db.Float, nullable=False)
+    close_price = db.Column(db.Float, nullable=False)
+    volume = db.Column(db.Float)
     source = db.Column(db.String(50), default="api")
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
 
+    asset = db.relationship("Asset", back_populates="price_data")
+
     __table_args__ = (
-        UniqueConstraint(
-            "asset_id", "timestamp", "interval", name="unique_asset_timestamp_interval"
+        # Enforces (asset_id, timestamp, interval) uniqueness and serves the
+        # latest-close probes and the returns window scans; carrying
+        # close_price lets both run as index-only scans.
+        Index(
+            "idx_price_data_asset_ts_close",
+            "asset_id",
+            "timestamp",
+            "interval",
+            unique=True,
+            postgresql_include=["close_price"],
         ),
-        Index("idx_price_data_timestamp", "timestamp"),
+        brin_index("idx_price_data_ts_brin", "timestamp"),
         CheckConstraint("open_price > 0", name="positive_open"),
         CheckConstraint("high_price > 0", name="positive_high"),
         CheckConstraint("low_price > 0", name="positive_low"),
         CheckConstraint("close_price > 0", name="positive_close"),
+        time_partition_by("timestamp"),
     )
 
 
-class PortfolioPerformance(db.Model):
+# On PostgreSQL a row trigger on price_data keeps one row per asset with its
+# newest close, so valuation reads are a primary-key lookup instead of a
+# newest-first probe into the (partitioned) price table.
+_LATEST_PRICE_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION asset_latest_price_upsert() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO asset_latest_prices (asset_id, close_price, timestamp)
+        VALUES (NEW.asset_id, NEW.close_price, NEW.timestamp)
+        ON CONFLICT (asset_id) DO UPDATE
+        SET close_price = EXCLUDED.close_price, timestamp = EXCLUDED.timestamp
+        WHERE asset_latest_prices.timestamp <= EXCLUDED.timestamp;
+        RETURN NULL;
+    END
+    $$
+    """
+)
+_LATEST_PRICE_TRIGGER = DDL(
+    "CREATE TRIGGER asset_latest_price_upsert "
+    "AFTER INSERT OR UPDATE OF close_price ON price_data "
+    "FOR EACH ROW EXECUTE FUNCTION asset_latest_price_upsert()"
+)
+_LATEST_PRICE_REBUILD = text(
+    """
+    INSERT INTO asset_latest_prices (asset_id, close_price, timestamp)
+    SELECT DISTINCT ON (asset_id) asset_id, close_price, timestamp
+    FROM price_data
+    ORDER BY asset_id, timestamp DESC
+    ON CONFLICT (asset_id) DO UPDATE
+    SET close_price = EXCLUDED.close_price, timestamp = EXCLUDED.timestamp
+    """
+)
+
+
+class AssetLatestPrice(db.Model):
+    __tablename__ = "asset_latest_prices"
+
+    asset_id = db.Column(uuid_col(), db.ForeignKey("assets.id"), primary_key=True)
+    close_price = db.Column(db.Float, nullable=False)
+    timestamp = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    @classmethod
+    def lookup(cls, session: Any, asset_ids: Iterable[Any]) -> Dict[Any, float]:
+        """Latest close per asset in one round trip: ``{asset_id: close}``.
+
+        Reads the trigger-maintained table on PostgreSQL; elsewhere joins
+        price_data to its per-asset MAX(timestamp).
+        """
+        wanted = list(asset_ids)
+        if not wanted:
+            return {}
+        if session.get_bind().dialect.name == "postgresql":
+            stmt = select(cls.asset_id, cls.close_price).where(cls.asset_id.in_(wanted))
+        else:
+            latest = (
+                select(PriceData.asset_id, func.max(PriceData.timestamp).label("ts"))
+                .where(PriceData.asset_id.in_(wanted))
+                .group_by(PriceData.asset_id)
+                .subquery()
+            )
+            stmt = select(PriceData.asset_id, PriceData.close_price).join(
+                latest,
+                and_(
+                    PriceData.asset_id == latest.c.asset_id,
+                    PriceData.timestamp == latest.c.ts,
+                ),
+            )
+        return {asset_id: close for asset_id, close in session.execute(stmt)}
+
+    @classmethod
+    def rebuild(cls, session: Any) -> None:
+        """Re-seed the table from price_data.
+
+        For rows written while the trigger was absent, e.g. before this table
+        existed. A no-op on other dialects, where ``lookup`` reads price_data
+        directly. The caller owns the transaction.
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            session.execute(_LATEST_PRICE_REBUILD)
+
+
+class PortfolioPerformance(_BulkLoadMixin, db.Model):
     __tablename__ = "portfolio_performance"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    portfolio_id = db.Column(
-        uuid_col(), db.ForeignKey("portfolios.id"), nullable=False, index=True
-    )
-    timestamp = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
-    total_value = db.Column(db.Numeric(20, 2), nullable=False)
-    cash_balance = db.Column(db.Numeric(20, 2), default=0)
-    invested_amount = db.Column(db.Numeric(20, 2), default=0)
+    id = uuid_pk(default=new_uuid7)
+    portfolio_id = db.Column(uuid_col(), db.ForeignKey("portfolios.id"), nullable=False)
+    # Partition key — PostgreSQL requires it in the primary key.
+    timestamp = db.Column(db.DateTime(timezone=True), primary_key=True, nullable=False)
+    total_value = db.Column(db.Float, nullable=False)
+    cash_balance = db.Column(db.Float, default=0)
+    invested_amount = db.Column(db.Float, default=0)
     daily_return = db.Column(db.Float)
     cumulative_return = db.Column(db.Float)
     benchmark_return = db.Column(db.Float)
@@ -448,45 +1144,72 @@ class PortfolioPerformance(db.Model):
     beta = db.Column(db.Float)
     alpha = db.Column(db.Float)
 
+    portfolio = db.relationship("Portfolio", back_populates="performance_history")
+
     __table_args__ = (
-        UniqueConstraint(
-            "portfolio_id", "timestamp", name="unique_portfolio_timestamp"
+        # Enforces (portfolio_id, timestamp) uniqueness. Performance history
+        # is read as (timestamp, total_value) per portfolio; the INCLUDE
+        # makes that an index-only range scan.
+        Index(
+            "idx_performance_portfolio_ts_value",
+            "portfolio_id",
+            "timestamp",
+            unique=True,
+            postgresql_include=["total_value"],
         ),
         Index("idx_performance_timestamp", "timestamp"),
+        partition_by_month("timestamp"),
     )
 
 
 class Alert(db.Model):
     __tablename__ = "alerts"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    user_id = db.Column(
-        uuid_col(), db.ForeignKey("users.id"), nullable=False, index=True
-    )
+    id = uuid_pk()
+    user_id = db.Column(uuid_col(), db.ForeignKey("users.id"), nullable=False)
     title = db.Column(db.String(255), nullable=False)
     message = db.Column(db.Text, nullable=False)
-    alert_type = db.Column(db.String(50), nullable=False, index=True)
+    alert_type = db.Column(db.String(50), nullable=False)
     severity = db.Column(db.String(20), default="info")
     is_read = db.Column(db.Boolean, default=False, nullable=False)
     is_dismissed = db.Column(db.Boolean, default=False, nullable=False)
     meta_data = db.Column(JsonType)
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        default=utcnow,
+        server_default=func.now(),
     )
     read_at = db.Column(db.DateTime(timezone=True))
 
+    user = db.relationship("User", back_populates="alerts")
+
     __table_args__ = (
-        Index("idx_alert_user_created", "user_id", "created_at"),
+        Index(
+            "idx_alert_user_created",
+            "user_id",
+            "created_at",
+            postgresql_include=["is_read", "title"],
+        ),
         Index("idx_alert_type_created", "alert_type", "created_at"),
+        Index(
+            "idx_unread_alerts",
+            "user_id",
+            "created_at",
+            postgresql_where=text("NOT is_read AND NOT is_dismissed"),
+        ),
+        jsonb_containment_index("idx_alert_meta_gin", "meta_data"),
+        partition_by_month("created_at"),
     )
 
 
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    user_id = db.Column(uuid_col(), db.ForeignKey("users.id"), index=True)
-    event_type = db.Column(db.String(100), nullable=False, index=True)
+    id = uuid_pk(default=new_uuid7)
+    user_id = db.Column(uuid_col(), db.ForeignKey("users.id"))
+    event_type = db.Column(db.String(100), nullable=False)
     event_description = db.Column(db.Text, nullable=False)
     ip_address = db.Column(db.String(45))
     user_agent = db.Column(db.Text)
@@ -496,23 +1219,34 @@ class AuditLog(db.Model):
     meta_data = db.Column(JsonType)
     created_at = db.Column(
         db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        index=True,
+        primary_key=True,
+        nullable=False,
+        default=utcnow,
+        server_default=func.now(),
     )
 
+    user = db.relationship("User", back_populates="audit_logs")
+
     __table_args__ = (
-        Index("idx_audit_user_created", "user_id", "created_at"),
-        Index("idx_audit_event_created", "event_type", "created_at"),
+        # Time windows come from partition pruning plus the BRIN; the B-trees
+        # only narrow by user or event and skip the created_at key.
+        brin_index("idx_audit_created_brin", "created_at"),
+        Index(
+            "idx_audit_user",
+            "user_id",
+            postgresql_where=text("user_id IS NOT NULL"),
+        ),
+        Index("idx_audit_event_type", "event_type"),
+        jsonb_containment_index("idx_audit_meta_gin", "meta_data"),
+        partition_by_month("created_at"),
     )
 
 
 class RiskMetrics(db.Model):
     __tablename__ = "risk_metrics"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    portfolio_id = db.Column(
-        uuid_col(), db.ForeignKey("portfolios.id"), nullable=False, index=True
-    )
+    id = uuid_pk()
+    portfolio_id = db.Column(uuid_col(), db.ForeignKey("portfolios.id"), nullable=False)
     calculation_date = db.Column(db.DateTime(timezone=True), nullable=False, index=True)
     var_95 = db.Column(db.Float)
     var_99 = db.Column(db.Float)
@@ -520,8 +1254,10 @@ class RiskMetrics(db.Model):
     cvar_99 = db.Column(db.Float)
     portfolio_volatility = db.Column(db.Float)
     portfolio_beta = db.Column(db.Float)
-    correlation_matrix = db.Column(JsonType)
-    stress_test_results = db.Column(JsonType)
+    # Compressed little-endian float32 buffer; see set/get_correlation_matrix.
+    correlation_matrix = db.Column(db.LargeBinary)
+    # Compressed JSON; see set/get_stress_test_results.
+    stress_test_results = db.Column(db.LargeBinary)
 
     __table_args__ = (
         UniqueConstraint(
@@ -529,37 +1265,61 @@ class RiskMetrics(db.Model):
         ),
     )
 
+    def set_correlation_matrix(self, matrix: np.ndarray) -> None:
+        self.correlation_matrix = compress_blob(
+            np.ascontiguousarray(matrix, dtype="<f4").tobytes()
+        )
+
+    def get_correlation_matrix(self) -> Optional[np.ndarray]:
+        """Square float32 matrix, or None if nothing is stored."""
+        if not self.correlation_matrix:
+            return None
+        flat = np.frombuffer(decompress_blob(self.correlation_matrix), dtype="<f4")
+        n = int(round(flat.size**0.5))
+        return flat.reshape(n, n)
+
+    def set_stress_test_results(self, results: Any) -> None:
+        self.stress_test_results = compress_blob(
+            json.dumps(results, separators=(",", ":")).encode("utf-8")
+        )
+
+    def get_stress_test_results(self) -> Any:
+        if not self.stress_test_results:
+            return None
+        return json.loads(decompress_blob(self.stress_test_results))
+
 
 class ComplianceCheck(db.Model):
     __tablename__ = "compliance_checks"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    user_id = db.Column(
-        uuid_col(), db.ForeignKey("users.id"), nullable=False, index=True
-    )
+    id = uuid_pk()
+    user_id = db.Column(uuid_col(), db.ForeignKey("users.id"), nullable=False)
     portfolio_id = db.Column(uuid_col(), db.ForeignKey("portfolios.id"), index=True)
-    check_type = db.Column(db.String(100), nullable=False, index=True)
+    check_type = db.Column(db.String(100), nullable=False)
     check_description = db.Column(db.Text, nullable=False)
-    status = db.Column(db.Enum(ComplianceStatus), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
     findings = db.Column(JsonType)
     recommendations = db.Column(db.Text)
     checked_at = db.Column(
         db.DateTime(timezone=True),
         nullable=False,
-        default=lambda: datetime.now(timezone.utc),
+        default=utcnow,
+        server_default=func.now(),
     )
     resolved_at = db.Column(db.DateTime(timezone=True))
 
     __table_args__ = (
         Index("idx_compliance_user_checked", "user_id", "checked_at"),
         Index("idx_compliance_type_status", "check_type", "status"),
+        _enum_check("status", ComplianceStatus, "valid_compliance_status"),
+        jsonb_containment_index("idx_compliance_findings_gin", "findings"),
     )
 
 
 class Watchlist(db.Model):
     __tablename__ = "watchlists"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
+    id = uuid_pk()
     user_id = db.Column(
         uuid_col(), db.ForeignKey("users.id"), nullable=False, index=True
     )
@@ -567,18 +1327,19 @@ class Watchlist(db.Model):
     description = db.Column(db.Text)
     is_default = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
     updated_at = db.Column(
         db.DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        default=utcnow,
+        server_default=func.now(),
+        onupdate=utcnow,
     )
 
     items = db.relationship(
         "WatchlistItem",
-        backref="watchlist",
-        lazy="dynamic",
+        back_populates="watchlist",
+        lazy="selectin",
         cascade="all, delete-orphan",
     )
 
@@ -596,18 +1357,56 @@ class Watchlist(db.Model):
 class WatchlistItem(db.Model):
     __tablename__ = "watchlist_items"
 
-    id = db.Column(uuid_col(), primary_key=True, default=new_uuid)
-    watchlist_id = db.Column(
-        uuid_col(), db.ForeignKey("watchlists.id"), nullable=False, index=True
-    )
+    id = uuid_pk()
+    watchlist_id = db.Column(uuid_col(), db.ForeignKey("watchlists.id"), nullable=False)
     asset_id = db.Column(
         uuid_col(), db.ForeignKey("assets.id"), nullable=False, index=True
     )
     notes = db.Column(db.Text)
     created_at = db.Column(
-        db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        db.DateTime(timezone=True), default=utcnow, server_default=func.now()
     )
 
+    watchlist = db.relationship("Watchlist", back_populates="items")
+
     __table_args__ = (
         UniqueConstraint("watchlist_id", "asset_id", name="unique_watchlist_asset"),
     )
+
+
+# Monthly range partitions (PostgreSQL only); indexes declared on the parent
+# are created on every partition automatically.
+for _partitioned in (Transaction, Alert, AuditLog, PortfolioPerformance):
+    register_monthly_partitions(_partitioned.__table__)
+
+# OHLCV tables: TimescaleDB hypertables when enabled, else monthly partitions.
+for _series in (PriceHistory, PriceData):
+    register_time_partitions(_series.__table__, "timestamp", segment_by="asset_id")
+
+# Prices/PnL (holdings, portfolios) and login bookkeeping (users) are
+# rewritten constantly; none of those columns is indexed, so with page
+# headroom the UPDATEs stay HOT.
+for _hot in (User, Portfolio, PortfolioHolding):
+    set_fillfactor(_hot.__table__, 80)
+
+# Audit rows are scanned by user/event/time and rarely read whole; keep the
+# free-form user agent uncompressed and out of line so the main tuple stays
+# narrow once a long header pushes the row past the TOAST threshold.
+set_column_storage(AuditLog.__table__, "user_agent", "external")
+
+for _ddl in (_HOLDINGS_ROLLUP_FUNCTION, *_HOLDINGS_ROLLUP_TRIGGERS):
+    event.listen(
+        PortfolioHolding.__table__,
+        "after_create",
+        _ddl.execute_if(dialect="postgresql"),
+    )
+
+for _ddl in (_LATEST_PRICE_FUNCTION, _LATEST_PRICE_TRIGGER):
+    event.listen(
+        PriceData.__table__,
+        "after_create",
+        _ddl.execute_if(dialect="postgresql"),
+    )
+
+# Server-side UUID defaults call gen_random_uuid().
+event.listen(db.metadata, "before_create", CREATE_PGCRYPTO)
@@ -2,16 +2,22 @@
 Portfolio management service: CRUD, transaction processing, performance analytics, optimization.
 """
 
+import functools
 import logging
+import math
+import threading
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from hashlib import blake2b
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from app.extensions import db
+from app.core.jit import compiled
+from app.extensions import cache, db
 from app.models.financial import (
     Asset,
+    AssetLatestPrice,
     Portfolio,
     PortfolioHolding,
     PortfolioPerformance,
@@ -19,10 +25,297 @@ from app.models.financial import (
     Transaction,
     TransactionType,
 )
-from sqlalchemy import and_
+from scipy.linalg import cho_factor, cho_solve
+from scipy.optimize import minimize
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, selectinload
 
 logger = logging.getLogger(__name__)
 
+# Column scales: quantity/price Numeric(.., 8), cash amounts Numeric(.., 2).
+_QTY_PLACES = Decimal("1e-8")
+_PRICE_PLACES = Decimal("1e-8")
+_CASH_PLACES = Decimal("1e-2")
+_ZERO = Decimal("0")
+
+# Annualisation over 252 trading days; the risk-free rate is 2% a year.
+_SQRT_252 = math.sqrt(252.0)
+_RF_DAILY = 0.02 / 252.0
+
+# Rows fetched per round trip when streaming price history.
+_STREAM_BATCH = 1000
+
+# Latest closes are re-read on every dashboard refresh. ORM flushes touching
+# price_data evict the keys immediately; Core bulk loads show up within the
+# timeout.
+_LATEST_PRICE_KEY = "latest_price:{}"
+_LATEST_PRICE_TIMEOUT = 30
+
+# Optimiser solves are keyed on assets, return floor and day; see
+# PortfolioService.optimize_portfolio.
+_OPTIMIZE_KEY = "optimize:{}"
+_OPTIMIZE_TIMEOUT = 900
+
+
+@event.listens_for(Session, "after_flush")
+def _evict_latest_prices(session: Session, _flush_context: Any) -> None:
+    # One delete_many per flush, however many price rows it wrote.
+    asset_ids = {
+        obj.asset_id
+        for obj in (*session.new, *session.dirty)
+        if isinstance(obj, PriceData)
+    }
+    if asset_ids:
+        cache.delete_many(*(_LATEST_PRICE_KEY.format(a) for a in asset_ids))
+
+
+def _to_decimal(value: Any, places: Decimal) -> Decimal:
+    """Convert a request number to Decimal at the column's scale.
+
+    Decimals and ints are used as-is; only floats go through ``str`` (their
+    shortest repr), which avoids binary-fraction digits. Quantizing up front
+    keeps every later product short instead of carrying full float expansions.
+    """
+    if isinstance(value, float):
+        value = str(value)
+    return Decimal(value).quantize(places)
+
+
+def _performance_kernel_numpy(
+    values: np.ndarray, rf: float
+) -> Tuple[float, float, float]:
+    """(annualised volatility %, Sharpe, max drawdown %) of a value series."""
+    prev = values[:-1]
+    returns = np.diff(values)
+    np.divide(returns, prev, out=returns, where=prev != 0)
+    mean_r = float(returns.mean())
+    std_r = float(returns.std())
+    volatility = std_r * _SQRT_252 * 100
+    sharpe = (mean_r - rf) / std_r * _SQRT_252 if std_r > 0 else 0.0
+    peak = np.maximum.accumulate(values)
+    drawdown = values - peak
+    np.divide(drawdown, peak, out=drawdown, where=peak != 0)
+    return volatility, sharpe, drawdown.min() * 100
+
+
+def _performance_kernel_loop(values, rf):
+    # Same metrics in a single pass: Welford mean/variance of the returns and
+    # a running peak for drawdown.
+    n = 0
+    mean_r = 0.0
+    m2 = 0.0
+    peak = values[0]
+    max_dd = 0.0
+    for i in range(1, values.size):
+        prev = values[i - 1]
+        r = values[i] - prev
+        if prev != 0:
+            r /= prev
+        n += 1
+        delta = r - mean_r
+        mean_r += delta / n
+        m2 += delta * (r - mean_r)
+        v = values[i]
+        if v > peak:
+            peak = v
+        dd = v - peak
+        if peak != 0:
+            dd /= peak
+        if dd < max_dd:
+            max_dd = dd
+    std_r = np.sqrt(m2 / n)
+    volatility = std_r * _SQRT_252 * 100.0
+    sharpe = (mean_r - rf) / std_r * _SQRT_252 if std_r > 0 else 0.0
+    return volatility, sharpe, max_dd * 100.0
+
+
+_performance_kernel = compiled(_performance_kernel_loop, _performance_kernel_numpy)
+
+
+def _min_variance_slsqp(cov: np.ndarray) -> Tuple[Optional[np.ndarray], float, str]:
+    """Long-only minimum variance solved directly with SLSQP.
+
+    Returns ``(weights, variance, status)``. For the handful of assets in a
+    portfolio this is far cheaper than building a CVXPY problem.
+    """
+    n = cov.shape[0]
+    ones = np.ones(n)
+    res = minimize(
+        lambda w: w @ cov @ w,
+        x0=np.full(n, 1.0 / n),
+        jac=lambda w: 2.0 * (cov @ w),
+        method="SLSQP",
+        bounds=[(0.0, 1.0)] * n,
+        constraints=[
+            {"type": "eq", "fun": lambda w: w.sum() - 1.0, "jac": lambda w: ones}
+        ],
+    )
+    if not res.success:
+        return None, 0.0, str(res.message)
+    return np.clip(res.x, 0.0, None), float(res.fun), "optimal"
+
+
+def _project_simplex(v):
+    # Euclidean projection onto {w >= 0, sum(w) = 1} (sort-based).
+    u = np.sort(v)[::-1]
+    css = 0.0
+    theta = 0.0
+    for i in range(u.size):
+        css += u[i]
+        t = (css - 1.0) / (i + 1)
+        if u[i] > t:
+            theta = t
+    return np.maximum(v - theta, 0.0)
+
+
+def _min_variance_pg_loop(cov, max_iter, tol):
+    # Accelerated projected gradient on w' S w over the simplex. The step is
+    # 1/L with L bounded by twice the largest absolute row sum of S. Returns
+    # (weights, converged); converged means an iterate moved less than tol
+    # before max_iter ran out.
+    n = cov.shape[0]
+    lip = 0.0
+    for i in range(n):
+        row = np.abs(cov[i]).sum()
+        if row > lip:
+            lip = row
+    w = np.full(n, 1.0 / n)
+    if lip <= 0.0:
+        return w, True
+    step = 0.5 / lip
+    y = w.copy()
+    t = 1.0
+    for _ in range(max_iter):
+        w_next = _project_simplex(y - step * 2.0 * (cov @ y))
+        t_next = (1.0 + np.sqrt(1.0 + 4.0 * t * t)) / 2.0
+        y = w_next + ((t - 1.0) / t_next) * (w_next - w)
+        delta = np.abs(w_next - w).max()
+        w = w_next
+        t = t_next
+        if delta < tol:
+            return w, True
+    return w, False
+
+
+# Compiled projected gradient beats SLSQP's setup cost for small portfolios;
+# without numba the SLSQP path handles every size.
+_PG_MAX_ASSETS = 32
+
+_project_simplex = compiled(_project_simplex, _project_simplex)
+_min_variance_pg = compiled(_min_variance_pg_loop)
+
+
+def _min_variance_closed_form(cov: np.ndarray) -> Optional[np.ndarray]:
+    """Unconstrained minimum-variance weights ``S^-1 1 / (1' S^-1 1)``.
+
+    ``None`` if the covariance is not positive definite or any weight is
+    negative; otherwise this is also the long-only optimum.
+    """
+    try:
+        factor = cho_factor(cov)
+    except np.linalg.LinAlgError:
+        return None
+    weights = cho_solve(factor, np.ones(cov.shape[0]))
+    total = weights.sum()
+    if total <= 0 or (weights < 0).any():
+        return None
+    return weights / total
+
+
+def _min_variance(cov: np.ndarray) -> Tuple[Optional[np.ndarray], float, str]:
+    """Long-only minimum variance.
+
+    Tries the closed form first, then the compiled kernel for small
+    portfolios and SLSQP otherwise. If the kernel runs out of iterations
+    (an ill-conditioned covariance), SLSQP is tried too and the better point
+    wins; a kernel point kept that way is reported ``"optimal_inaccurate"``.
+    """
+    weights = _min_variance_closed_form(cov)
+    if weights is not None:
+        return weights, float(weights @ cov @ weights), "optimal"
+    if _min_variance_pg is None or cov.shape[0] > _PG_MAX_ASSETS:
+        return _min_variance_slsqp(cov)
+    weights, converged = _min_variance_pg(np.ascontiguousarray(cov), 5000, 1e-10)
+    variance = float(weights @ cov @ weights)
+    if converged:
+        return weights, variance, "optimal"
+    fallback = _min_variance_slsqp(cov)
+    if fallback[0] is not None and fallback[1] <= variance:
+        return fallback
+    return weights, variance, "optimal_inaccurate"
+
+
+@functools.lru_cache(maxsize=16)
+def _target_return_problem(n: int) -> Tuple[Any, ...]:
+    """Long-only min-variance problem with a return floor, compiled once per *n*.
+
+    The covariance enters through a factor Parameter, so later solves skip
+    canonicalisation and warm-start from the previous solution. The lock
+    serialises use of the shared Problem across request threads.
+    """
+    import cvxpy as cp
+
+    w = cp.Variable(n)
+    factor = cp.Parameter((n, n))
+    mu = cp.Parameter(n)
+    target = cp.Parameter()
+    prob = cp.Problem(
+        cp.Minimize(cp.sum_squares(factor.T @ w)),
+        [cp.sum(w) == 1, w >= 0, mu @ w >= target],
+    )
+    return w, factor, mu, target, prob, threading.Lock()
+
+
+def _min_variance_cvxpy(
+    cov: np.ndarray, exp_ret: np.ndarray, target_return: float
+) -> Tuple[Optional[np.ndarray], float, str]:
+    """Minimum variance subject to ``exp_ret @ w >= target_return`` (CVXPY).
+
+    OSQP is tried first: it keeps its factorisation between calls on the
+    cached problem, so nearby covariances converge in a few iterations.
+    Anything short of optimal is re-solved with CVXPY's default solver.
+    """
+    import cvxpy as cp
+
+    w, factor, mu, target, prob, lock = _target_return_problem(cov.shape[0])
+    # Sigma = F F^T with F from the eigendecomposition, so the objective
+    # ||F^T w||^2 stays DPP and the compiled problem is reused.
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    with lock:
+        factor.value = eigvecs * np.sqrt(np.clip(eigvals, 0.0, None))
+        mu.value = exp_ret
+        target.value = target_return
+        try:
+            prob.solve(
+                solver=cp.OSQP,
+                warm_start=True,
+                eps_abs=1e-7,
+                eps_rel=1e-7,
+                max_iter=10000,
+            )
+        except cp.error.SolverError:
+            pass
+        if prob.status != cp.OPTIMAL:
+            prob.solve(warm_start=True)
+        weights = None if w.value is None else w.value.copy()
+        return weights, float(prob.value or 0.0), prob.status
+
+
+def _latest_close() -> Any:
+    """Latest close of each holding's asset, correlated to ``PortfolioHolding``.
+
+    A LIMIT 1 probe per holding that the (asset_id, timestamp) unique index
+    answers directly.
+    """
+    return (
+        select(PriceData.close_price)
+        .where(PriceData.asset_id == PortfolioHolding.asset_id)
+        .order_by(PriceData.timestamp.desc())
+        .limit(1)
+        .correlate(PortfolioHolding)
+        .scalar_subquery()
+    )
+
 
 class PortfolioService:
     """Service for portfolio management and analytics."""
@@ -77,15 +370,20 @@ class PortfolioService:
     @staticmethod
     def get_user_portfolios(user_id: str) -> Dict[str, Any]:
         try:
-            portfolios = Portfolio.query.filter_by(
-                user_id=user_id, is_active=True
-            ).all()
+            # Portfolios and their holding counts in one grouped query.
+            rows = (
+                db.session.query(Portfolio, func.count(PortfolioHolding.id))
+                .outerjoin(
+                    PortfolioHolding, PortfolioHolding.portfolio_id == Portfolio.id
+                )
+                .filter(Portfolio.user_id == user_id, Portfolio.is_active.is_(True))
+                .group_by(Portfolio.id)
+                .all()
+            )
             result = []
-            for p in portfolios:
+            for p, holdings_count in rows:
                 d = p.to_dict()
-                d["holdings_count"] = PortfolioHolding.query.filter_by(
-                    portfolio_id=p.id
-                ).count()
+                d["holdings_count"] = holdings_count
                 result.append(d)
             return {"success": True, "portfolios": result}
         except Exception as exc:
@@ -95,6 +393,7 @@ class PortfolioService:
     @staticmethod
     def get_portfolio_details(portfolio_id: str, user_id: str) -> Dict[str, Any]:
         try:
+            # Holdings come from the join below, not the relationship.
             portfolio = Portfolio.query.filter_by(
                 id=portfolio_id, user_id=user_id
             ).first()
@@ -107,48 +406,127 @@ class PortfolioService:
                 .filter(PortfolioHolding.portfolio_id == portfolio_id)
                 .all()
             )
+            # Served from the price cache; only misses reach price_data.
+            prices = PortfolioService._get_latest_prices_bulk(
+                [holding.asset_id for holding, _ in rows]
+            )
 
-            holdings_data = []
-            total_value = Decimal("0")
-
-            for holding, asset in rows:
-                latest_price = PortfolioService._get_latest_price(asset.id)
-                if latest_price:
-                    holding.current_price = latest_price
-                    holding.market_value = holding.quantity * latest_price
-                    holding.unrealized_pnl = holding.market_value - (
-                        holding.quantity * holding.average_cost
+            # Value the holdings column-wise: one float row per holding of
+            # (quantity, cost, latest close or NaN, stored price/value/P&L).
+            # Holdings without a close keep their stored valuation.
+            cols = np.array(
+                [
+                    (
+                        h.quantity or 0,
+                        h.average_cost or 0,
+                        prices.get(h.asset_id) or np.nan,
+                        h.current_price or 0,
+                        h.market_value or 0,
+                        h.unrealized_pnl or 0,
                     )
-                    if holding.average_cost and holding.average_cost > 0:
-                        holding.unrealized_pnl_percent = float(
-                            (holding.current_price - holding.average_cost)
-                            / holding.average_cost
-                            * 100
-                        )
-                    total_value += holding.market_value or Decimal("0")
-
-                h_dict = holding.to_dict()
-                h_dict["asset"] = asset.to_dict()
-                holdings_data.append(h_dict)
+                    for h, _ in rows
+                ],
+                dtype=np.float64,
+            ).reshape(-1, 6)
+            qty, avg_cost, latest, price, market_value, pnl = cols.T
+            priced = ~np.isnan(latest)
+            price = np.where(priced, latest, price)
+            market_value = np.where(priced, qty * latest, market_value)
+            pnl = np.where(priced, market_value - qty * avg_cost, pnl)
+            has_pct = priced & (avg_cost > 0)
+            pnl_pct = np.divide(
+                (latest - avg_cost) * 100.0,
+                avg_cost,
+                out=np.zeros_like(avg_cost),
+                where=has_pct,
+            )
+            total_value = float(market_value[priced].sum())
+            allocs = (
+                market_value * (100.0 / total_value)
+                if total_value > 0
+                else np.zeros_like(market_value)
+            )
 
-            portfolio.total_value = total_value
-            for h in holdings_data:
-                h["current_allocation"] = (
-                    float(Decimal(str(h["market_value"])) / total_value * 100)
-                    if total_value > 0
-                    else 0
+            # Valuation is computed for the response only; stored values are
+            # refreshed in bulk by refresh_valuations, not on every read.
+            holdings_data = []
+            for i, (holding, asset) in enumerate(rows):
+                h_dict = PortfolioService._holding_response(
+                    holding,
+                    asset,
+                    float(qty[i]),
+                    float(avg_cost[i]),
+                    float(price[i]),
+                    float(market_value[i]),
+                    float(pnl[i]),
+                    (
+                        float(pnl_pct[i])
+                        if has_pct[i]
+                        else holding.unrealized_pnl_percent
+                    ),
                 )
+                h_dict["current_allocation"] = float(allocs[i])
+                holdings_data.append(h_dict)
 
-            db.session.commit()
             d = portfolio.to_dict()
             d["holdings"] = holdings_data
-            d["total_value"] = float(total_value)
+            d["total_value"] = total_value
             return {"success": True, "portfolio": d}
         except Exception as exc:
-            db.session.rollback()
             logger.error("Error getting portfolio details: %s", exc)
             return {"success": False, "error": str(exc)}
 
+    @staticmethod
+    def refresh_valuations(portfolio_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Persist holding and portfolio valuations at the latest closes.
+
+        Meant for a scheduled job; defaults to every active portfolio.
+        """
+        try:
+            if portfolio_ids is None:
+                portfolio_ids = db.session.scalars(
+                    select(Portfolio.id).where(Portfolio.is_active.is_(True))
+                ).all()
+            for portfolio_id in portfolio_ids:
+                Portfolio.refresh_valuation(db.session, portfolio_id)
+            db.session.commit()
+            return {"success": True, "refreshed": len(portfolio_ids)}
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("Error refreshing portfolio valuations: %s", exc)
+            return {"success": False, "error": str(exc)}
+
+    @staticmethod
+    def _holding_response(
+        holding: PortfolioHolding,
+        asset: Asset,
+        qty: float,
+        avg_cost: float,
+        price: float,
+        market_value: float,
+        pnl: float,
+        pnl_pct: Optional[float],
+    ) -> Dict[str, Any]:
+        """Holding payload built from already-converted values.
+
+        Same keys as ``PortfolioHolding.to_dict`` with the asset nested, but
+        without reading back (and re-converting) the attributes just valued.
+        """
+        return {
+            "id": str(holding.id),
+            "portfolio_id": str(holding.portfolio_id),
+            "asset_id": str(holding.asset_id),
+            "quantity": qty,
+            "average_cost": avg_cost,
+            "current_price": price,
+            "market_value": market_value,
+            "unrealized_pnl": pnl,
+            "unrealized_pnl_percent": pnl_pct,
+            "weight": holding.weight,
+            "target_weight": holding.target_weight,
+            "asset": asset.to_dict(),
+        }
+
     @staticmethod
     def add_transaction(
         portfolio_id: str,
@@ -167,8 +545,9 @@ class PortfolioService:
             if not portfolio:
                 return {"success": False, "error": "Portfolio not found"}
 
-            asset = Asset.query.filter_by(symbol=asset_symbol.upper()).first()
-            if not asset:
+            symbol = asset_symbol.upper()
+            asset_id = Asset.resolve(db.session, [symbol]).get(symbol)
+            if asset_id is None:
                 return {"success": False, "error": f"Asset {asset_symbol} not found"}
 
             try:
@@ -179,15 +558,15 @@ class PortfolioService:
                     "error": f"Invalid transaction type: {transaction_type}",
                 }
 
-            qty = Decimal(str(quantity))
-            px = Decimal(str(price))
-            fee = Decimal(str(fees))
+            qty = _to_decimal(quantity, _QTY_PLACES)
+            px = _to_decimal(price, _PRICE_PLACES)
+            fee = _to_decimal(fees, _CASH_PLACES)
             total_amount = qty * px + fee
 
             transaction = Transaction(
                 user_id=user_id,
                 portfolio_id=portfolio_id,
-                asset_id=asset.id,
+                asset_id=asset_id,
                 transaction_type=trans_type,
                 quantity=qty,
                 price=px,
@@ -198,7 +577,7 @@ class PortfolioService:
             db.session.add(transaction)
 
             holding = PortfolioHolding.query.filter_by(
-                portfolio_id=portfolio_id, asset_id=asset.id
+                portfolio_id=portfolio_id, asset_id=asset_id
             ).first()
 
             if trans_type == TransactionType.BUY:
@@ -210,7 +589,7 @@ class PortfolioService:
                 else:
                     holding = PortfolioHolding(
                         portfolio_id=portfolio_id,
-                        asset_id=asset.id,
+                        asset_id=asset_id,
                         quantity=qty,
                         average_cost=px,
                     )
@@ -222,10 +601,10 @@ class PortfolioService:
                 realized_pnl = (px - holding.average_cost) * qty
                 transaction.realized_pnl = realized_pnl
                 portfolio.realized_pnl = (
-                    portfolio.realized_pnl or Decimal("0")
+                    portfolio.realized_pnl or _ZERO
                 ) + realized_pnl
                 holding.quantity -= qty
-                if holding.quantity <= Decimal("0"):
+                if holding.quantity <= _ZERO:
                     db.session.delete(holding)
 
             db.session.commit()
@@ -246,16 +625,18 @@ class PortfolioService:
             if not portfolio:
                 return {"success": False, "error": "Portfolio not found"}
 
-            paginated = (
-                Transaction.query.filter_by(portfolio_id=portfolio_id)
-                .order_by(Transaction.executed_at.desc())
-                .paginate(page=page, per_page=per_page, error_out=False)
+            total = Transaction.query.filter_by(portfolio_id=portfolio_id).count()
+            transactions = Transaction.page_dicts(
+                db.session,
+                portfolio_id,
+                limit=per_page,
+                offset=(max(page, 1) - 1) * per_page,
             )
             return {
                 "success": True,
-                "transactions": [t.to_dict() for t in paginated.items],
-                "total": paginated.total,
-                "pages": paginated.pages,
+                "transactions": transactions,
+                "total": total,
+                "pages": math.ceil(total / per_page) if per_page > 0 else 0,
                 "page": page,
                 "per_page": per_page,
             }
@@ -277,17 +658,18 @@ class PortfolioService:
             end_date = datetime.now(timezone.utc)
             start_date = end_date - timedelta(days=days)
 
-            perf_records = (
-                PortfolioPerformance.query.filter(
-                    and_(
-                        PortfolioPerformance.portfolio_id == portfolio_id,
-                        PortfolioPerformance.timestamp >= start_date,
-                        PortfolioPerformance.timestamp <= end_date,
-                    )
+            # Only the series itself, as plain tuples: no ORM objects, and
+            # the (portfolio_id, timestamp) INCLUDE (total_value) index
+            # answers it without touching the heap.
+            perf_records = db.session.execute(
+                select(PortfolioPerformance.timestamp, PortfolioPerformance.total_value)
+                .where(
+                    PortfolioPerformance.portfolio_id == portfolio_id,
+                    PortfolioPerformance.timestamp >= start_date,
+                    PortfolioPerformance.timestamp <= end_date,
                 )
                 .order_by(PortfolioPerformance.timestamp)
-                .all()
-            )
+            ).all()
 
             if not perf_records:
                 current_value = PortfolioService._calculate_current_value(portfolio_id)
@@ -304,27 +686,21 @@ class PortfolioService:
                     },
                 }
 
-            values = [float(p.total_value) for p in perf_records]
-            dates = [p.timestamp.isoformat() for p in perf_records]
+            arr = np.fromiter(
+                (value for _, value in perf_records),
+                dtype=np.float64,
+                count=len(perf_records),
+            )
+            values = arr.tolist()
+            dates = [ts.isoformat() for ts, _ in perf_records]
 
-            if len(values) > 1:
-                arr = np.array(values)
-                denom = np.where(arr[:-1] != 0, arr[:-1], 1)
-                returns = np.diff(arr) / denom
+            if arr.size > 1:
                 total_return = (
                     (values[-1] - values[0]) / values[0] * 100 if values[0] > 0 else 0
                 )
-                volatility = float(np.std(returns) * np.sqrt(252) * 100)
-                rf = 0.02 / 252
-                excess = returns - rf
-                sharpe_ratio = (
-                    float(np.mean(excess) / np.std(returns) * np.sqrt(252))
-                    if np.std(returns) > 0
-                    else 0
+                volatility, sharpe_ratio, max_drawdown = (
+                    float(x) for x in _performance_kernel(arr, _RF_DAILY)
                 )
-                peak = np.maximum.accumulate(arr)
-                drawdown = (arr - peak) / np.where(peak != 0, peak, 1)
-                max_drawdown = float(np.min(drawdown) * 100)
             else:
                 total_return = volatility = sharpe_ratio = max_drawdown = 0
 
@@ -353,88 +729,64 @@ class PortfolioService:
         risk_tolerance: float = 0.5,
     ) -> Dict[str, Any]:
         try:
-            import cvxpy as cp
-        except ImportError:
-            return {
-                "success": False,
-                "error": "cvxpy not installed. Cannot optimize portfolio.",
-            }
-
-        try:
-            portfolio = Portfolio.query.filter_by(
-                id=portfolio_id, user_id=user_id
-            ).first()
+            portfolio = (
+                Portfolio.query.options(
+                    selectinload(Portfolio.holdings).selectinload(
+                        PortfolioHolding.asset
+                    )
+                )
+                .filter_by(id=portfolio_id, user_id=user_id)
+                .first()
+            )
             if not portfolio:
                 return {"success": False, "error": "Portfolio not found"}
 
-            holdings = PortfolioHolding.query.filter_by(portfolio_id=portfolio_id).all()
+            holdings = portfolio.holdings
             if len(holdings) < 2:
                 return {
                     "success": False,
                     "error": "Need at least 2 assets for optimization",
                 }
 
-            asset_returns = {}
-            symbols = []
-            for h in holdings:
-                rets = PortfolioService._get_asset_returns(h.asset_id, days=252)
-                if rets is not None and len(rets) > 0:
-                    asset = db.session.get(Asset, h.asset_id)
-                    if asset:
-                        asset_returns[asset.symbol] = rets
-                        symbols.append(asset.symbol)
-
-            if len(asset_returns) < 2:
-                return {
-                    "success": False,
-                    "error": "Insufficient price data for optimization",
-                }
-
-            min_len = min(len(v) for v in asset_returns.values())
-            for k in asset_returns:
-                asset_returns[k] = asset_returns[k][-min_len:]
-
-            df = pd.DataFrame(asset_returns)
-            exp_ret = df.mean().values * 252
-            cov = df.cov().values * 252
-            n = len(symbols)
-
-            w = cp.Variable(n)
-            obj = cp.Minimize(cp.quad_form(w, cov))
-            prob = cp.Problem(obj, [cp.sum(w) == 1, w >= 0])
-            prob.solve()
-
-            if prob.status not in ["optimal", "optimal_inaccurate"]:
-                return {
-                    "success": False,
-                    "error": f"Optimization failed: {prob.status}",
-                }
+            holdings_by_symbol = {
+                h.asset.symbol: h for h in holdings if h.asset is not None
+            }
 
-            opt_w = w.value
-            port_ret = float(np.dot(opt_w, exp_ret))
-            port_vol = float(np.sqrt(max(float(prob.value), 0)))
+            asset_ids = {sym: h.asset_id for sym, h in holdings_by_symbol.items()}
+            # The solve depends only on the assets, the return floor and the
+            # daily closes, so repeat requests within a day reuse it.
+            fingerprint = repr(
+                (
+                    sorted((sym, str(a)) for sym, a in asset_ids.items()),
+                    target_return,
+                    datetime.now(timezone.utc).date().isoformat(),
+                )
+            )
+            key = _OPTIMIZE_KEY.format(
+                blake2b(fingerprint.encode("utf-8"), digest_size=16).hexdigest()
+            )
+            solved = cache.get(key)
+            if solved is None:
+                solved = PortfolioService._solve_allocation(asset_ids, target_return)
+                if solved["success"]:
+                    cache.set(key, solved, timeout=_OPTIMIZE_TIMEOUT)
+            if not solved["success"]:
+                return solved
+            port_ret = solved["expected_return"]
+            port_vol = solved["volatility"]
             sharpe = (port_ret - 0.02) / port_vol if port_vol > 0 else 0
 
             recs = []
-            for i, sym in enumerate(symbols):
-                holding = next(
-                    (
-                        h
-                        for h in holdings
-                        if db.session.get(Asset, h.asset_id)
-                        and db.session.get(Asset, h.asset_id).symbol == sym
-                    ),
-                    None,
-                )
+            for sym, opt in solved["weights"].items():
+                holding = holdings_by_symbol.get(sym)
                 cur_w = 0.0
                 if (
                     holding
                     and portfolio.total_value
                     and float(portfolio.total_value) > 0
                 ):
-                    mv = holding.market_value or Decimal("0")
-                    cur_w = float(mv) / float(portfolio.total_value)
-                opt = float(opt_w[i])
+                    mv = holding.market_value or 0.0
+                    cur_w = mv / float(portfolio.total_value)
                 diff = opt - cur_w
                 recs.append(
                     {
@@ -463,54 +815,143 @@ class PortfolioService:
             return {"success": False, "error": str(exc)}
 
     @staticmethod
-    def _get_latest_price(asset_id: str) -> Optional[Decimal]:
+    def _solve_allocation(
+        asset_ids: Dict[str, Any], target_return: Optional[float]
+    ) -> Dict[str, Any]:
+        """Minimum-variance weights for ``{symbol: asset_id}``.
+
+        Returns ``{"success": True, "weights": {symbol: w}, "expected_return",
+        "volatility"}`` (annualised fractions) or a failure dict.
+        """
+        returns_df = PortfolioService._get_asset_returns_bulk(
+            list(asset_ids.values()), days=252
+        ).rename(columns={a: sym for sym, a in asset_ids.items()})
+        if returns_df.shape[1] < 2 or len(returns_df) < 2:
+            return {
+                "success": False,
+                "error": "Insufficient price data for optimization",
+            }
+
+        symbols = list(returns_df.columns)
+        # The T x N GEMM runs in float32 (half the bytes through BLAS);
+        # means accumulate in float64 and the solvers get float64 back.
+        # The array is a private copy, so it is centred in place.
+        returns = returns_df.to_numpy(dtype=np.float32, copy=True)
+        mean_r = returns.mean(axis=0, dtype=np.float64)
+        returns -= mean_r.astype(np.float32)
+        exp_ret = mean_r * 252.0
+        cov = (returns.T @ returns).astype(np.float64) * (
+            252.0 / (returns.shape[0] - 1)
+        )
+
+        if target_return is None:
+            opt_w, variance, status = _min_variance(cov)
+        else:
+            try:
+                opt_w, variance, status = _min_variance_cvxpy(
+                    cov, exp_ret, float(target_return)
+                )
+            except ImportError:
+                return {
+                    "success": False,
+                    "error": "cvxpy not installed. Cannot optimize for a "
+                    "target return.",
+                }
+
+        if opt_w is None or status not in ["optimal", "optimal_inaccurate"]:
+            return {
+                "success": False,
+                "error": f"Optimization failed: {status}",
+            }
+
+        return {
+            "success": True,
+            "weights": dict(zip(symbols, opt_w.tolist())),
+            "expected_return": float(np.dot(opt_w, exp_ret)),
+            "volatility": float(np.sqrt(max(variance, 0.0))),
+        }
+
+    @staticmethod
+    def _get_latest_prices_bulk(asset_ids: List[Any]) -> Dict[Any, float]:
+        """Latest close per asset: ``{asset_id: close}``.
+
+        Cached closes are served first; the rest come from one round trip.
+        """
+        if not asset_ids:
+            return {}
         try:
-            row = (
-                PriceData.query.filter_by(asset_id=asset_id)
-                .order_by(PriceData.timestamp.desc())
-                .first()
-            )
-            return row.close_price if row else None
+            wanted = list(dict.fromkeys(asset_ids))
+            cached = cache.get_many(*(_LATEST_PRICE_KEY.format(a) for a in wanted))
+            found = {a: p for a, p in zip(wanted, cached) if p is not None}
+            missing = [a for a in wanted if a not in found]
+            if not missing:
+                return found
+            fetched = AssetLatestPrice.lookup(db.session, missing)
+            if fetched:
+                cache.set_many(
+                    {_LATEST_PRICE_KEY.format(a): p for a, p in fetched.items()},
+                    timeout=_LATEST_PRICE_TIMEOUT,
+                )
+            found.update(fetched)
+            return found
         except Exception as exc:
-            logger.error("Error getting latest price: %s", exc)
-            return None
+            logger.error("Error getting latest prices: %s", exc)
+            return {}
 
     @staticmethod
-    def _calculate_current_value(portfolio_id: str) -> Decimal:
+    def _calculate_current_value(portfolio_id: str) -> float:
         try:
-            holdings = PortfolioHolding.query.filter_by(portfolio_id=portfolio_id).all()
-            total = Decimal("0")
-            for h in holdings:
-                price = PortfolioService._get_latest_price(h.asset_id)
-                if price:
-                    total += h.quantity * price
-            return total
+            # Holdings without a price contribute NULL, which SUM skips.
+            total = db.session.scalar(
+                select(
+                    func.coalesce(
+                        func.sum(PortfolioHolding.quantity * _latest_close()), 0
+                    )
+                ).where(PortfolioHolding.portfolio_id == portfolio_id)
+            )
+            return float(total)
         except Exception as exc:
             logger.error("Error calculating portfolio value: %s", exc)
-            return Decimal("0")
+            return 0.0
 
     @staticmethod
-    def _get_asset_returns(asset_id: str, days: int = 252) -> Optional[np.ndarray]:
+    def _get_asset_returns_bulk(asset_ids: List[Any], days: int = 252) -> pd.DataFrame:
+        """Date-aligned daily returns, one column per asset id, from one query.
+
+        Assets with fewer than two closes in the window are left out. Each
+        asset's returns run between its own consecutive closes, so a Monday
+        equity return spans the weekend a crypto column trades through; rows
+        are the dates on which every remaining asset has a return.
+        """
         try:
             end = datetime.now(timezone.utc)
             start = end - timedelta(days=days)
-            rows = (
-                PriceData.query.filter(
-                    and_(
-                        PriceData.asset_id == asset_id,
-                        PriceData.timestamp >= start,
-                        PriceData.timestamp <= end,
-                        PriceData.interval == "1d",
-                    )
+            stmt = (
+                select(PriceData.asset_id, PriceData.timestamp, PriceData.close_price)
+                .where(
+                    PriceData.asset_id.in_(asset_ids),
+                    PriceData.timestamp >= start,
+                    PriceData.timestamp <= end,
+                    PriceData.interval == "1d",
                 )
-                .order_by(PriceData.timestamp)
-                .all()
+                .order_by(PriceData.asset_id, PriceData.timestamp)
+                .execution_options(yield_per=_STREAM_BATCH)
             )
-            if len(rows) < 2:
-                return None
-            prices = np.array([float(r.close_price) for r in rows])
-            denom = np.where(prices[:-1] != 0, prices[:-1], 1)
-            return np.diff(prices) / denom
+            # Stream plain tuples straight into the frame; no intermediate list.
+            prices = pd.DataFrame.from_records(
+                db.session.execute(stmt), columns=["asset_id", "timestamp", "close"]
+            )
+            if prices.empty:
+                return pd.DataFrame()
+            prices = prices.pivot(index="timestamp", columns="asset_id", values="close")
+            prices = prices.sort_index().loc[:, prices.count() >= 2]
+            if prices.empty:
+                return pd.DataFrame()
+            returns = {
+                asset_id: closes.dropna().pct_change().iloc[1:]
+                for asset_id, closes in prices.items()
+            }
+            return pd.concat(returns, axis=1, join="inner")
         except Exception as exc:
             logger.error("Error getting asset returns: %s", exc)
-            return None
+            return pd.DataFrame()
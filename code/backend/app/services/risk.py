@@ -4,13 +4,158 @@ stress testing, concentration risk.
 """
 
 import logging
+import math
 from typing import Any, Dict, List, Optional
 
 import numpy as np
+from app.core.jit import compiled
 from scipy import stats
 
 logger = logging.getLogger(__name__)
 
+_SQRT_252 = math.sqrt(252.0)
+_MC_SIMULATIONS = 2_000
+
+# Standard normal quantiles for the usual VaR tail probabilities; other
+# levels fall back to scipy.
+_Z_SCORES = {
+    0.10: -1.2815515655446004,
+    0.05: -1.6448536269514729,
+    0.025: -1.959963984540054,
+    0.01: -2.3263478740408408,
+}
+
+
+def _tail_mean_numpy(returns: np.ndarray, threshold: float) -> float:
+    """Mean of the returns at or below *threshold* (*threshold* if none)."""
+    tail = returns[returns <= threshold]
+    return tail.mean() if tail.size else threshold
+
+
+def _tail_mean_loop(returns, threshold):
+    # Same result in one pass without the boolean mask and tail copy.
+    total = 0.0
+    count = 0
+    for r in returns:
+        if r <= threshold:
+            total += r
+            count += 1
+    return total / count if count else threshold
+
+
+_tail_mean = compiled(_tail_mean_loop, _tail_mean_numpy)
+
+
+def _return_stats_numpy(returns: np.ndarray):
+    """Return ``(mean, std, skew, excess_kurt, downside_std, max_drawdown)``.
+
+    Moments are population (``ddof=0``, biased) as in ``np.std`` and
+    ``scipy.stats.skew``/``kurtosis``; skew and kurtosis are NaN for a
+    constant series.
+    """
+    mean = returns.mean()
+    c = returns - mean
+    c2 = c * c
+    m2 = c2.mean()
+    if m2 > 0:
+        skew = (c2 * c).mean() / m2**1.5
+        kurt = (c2 * c2).mean() / (m2 * m2) - 3.0
+    else:
+        skew = kurt = np.nan
+    down = returns[returns < 0]
+    down_std = down.std() if down.size else 0.0
+    cum = np.cumprod(1 + returns)
+    peak = np.maximum.accumulate(cum)
+    max_dd = ((cum - peak) / np.where(peak != 0, peak, 1)).min()
+    return mean, np.sqrt(m2), skew, kurt, down_std, max_dd
+
+
+def _return_stats_loop(returns):
+    # Same result in one pass: running central moments (Welford/Terriberry
+    # updates), a Welford variance over the negative returns and a running
+    # wealth peak for the drawdown.
+    n = 0
+    mean = m2 = m3 = m4 = 0.0
+    n_down = 0
+    down_mean = down_m2 = 0.0
+    wealth = 1.0
+    peak = -np.inf
+    max_dd = 0.0
+    for r in returns:
+        n1 = n
+        n += 1
+        delta = r - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        mean += delta_n
+        m4 += (
+            term1 * delta_n2 * (n * n - 3 * n + 3)
+            + 6.0 * delta_n2 * m2
+            - 4.0 * delta_n * m3
+        )
+        m3 += term1 * delta_n * (n - 2) - 3.0 * delta_n * m2
+        m2 += term1
+        if r < 0:
+            n_down += 1
+            d = r - down_mean
+            down_mean += d / n_down
+            down_m2 += d * (r - down_mean)
+        wealth *= 1.0 + r
+        if wealth > peak:
+            peak = wealth
+        dd = (wealth - peak) / (peak if peak != 0 else 1.0)
+        if dd < max_dd:
+            max_dd = dd
+    if m2 > 0:
+        skew = np.sqrt(n) * m3 / m2**1.5
+        kurt = n * m4 / (m2 * m2) - 3.0
+    else:
+        skew = kurt = np.nan
+    down_std = np.sqrt(down_m2 / n_down) if n_down else 0.0
+    return mean, np.sqrt(m2 / n), skew, kurt, down_std, max_dd
+
+
+_return_stats = compiled(_return_stats_loop, _return_stats_numpy)
+
+
+def _co_moments_numpy(returns: np.ndarray, benchmark: np.ndarray):
+    """Return ``(mean_b, var_p, var_b, cov_pb)``, population (``ddof=0``)."""
+    cp = returns - returns.mean()
+    mean_b = benchmark.mean()
+    cb = benchmark - mean_b
+    n = returns.size
+    return mean_b, cp @ cp / n, cb @ cb / n, cp @ cb / n
+
+
+def _co_moments_loop(returns, benchmark):
+    # Same result in one pass over both series with Welford co-moment
+    # updates.
+    n = 0
+    mean_p = mean_b = 0.0
+    m_pp = m_bb = m_pb = 0.0
+    for i in range(returns.shape[0]):
+        p = returns[i]
+        b = benchmark[i]
+        n += 1
+        dp = p - mean_p
+        db = b - mean_b
+        mean_p += dp / n
+        mean_b += db / n
+        m_pp += dp * (p - mean_p)
+        m_bb += db * (b - mean_b)
+        m_pb += dp * (b - mean_b)
+    return mean_b, m_pp / n, m_bb / n, m_pb / n
+
+
+_co_moments = compiled(_co_moments_loop, _co_moments_numpy)
+
+
+def _z_score(alpha: float) -> float:
+    """Standard normal quantile at tail probability *alpha*."""
+    z = _Z_SCORES.get(alpha)
+    return z if z is not None else float(stats.norm.ppf(alpha))
+
 
 class RiskManagementService:
     """Portfolio risk assessment — operates on numpy return arrays."""
@@ -31,24 +176,36 @@ class RiskManagementService:
             method: 'historical' | 'parametric' | 'monte_carlo'.
         """
         if method == "historical":
-            return float(np.percentile(returns * np.sqrt(time_horizon), alpha * 100))
+            # Percentiles scale with a positive factor: scale the result,
+            # not a copy of the series.
+            return float(np.percentile(returns, alpha * 100) * np.sqrt(time_horizon))
         if method == "parametric":
             mu = np.mean(returns) * time_horizon
             sigma = np.std(returns) * np.sqrt(time_horizon)
-            return float(mu + stats.norm.ppf(alpha) * sigma)
+            return float(mu + _z_score(alpha) * sigma)
         if method == "monte_carlo":
             mu, sigma = np.mean(returns), np.std(returns)
             rng = np.random.default_rng(42)
-            sim = rng.normal(mu, sigma, (10_000, time_horizon)).sum(axis=1)
-            return float(np.percentile(sim, alpha * 100))
+            # A sum of time_horizon iid N(mu, sigma) draws is exactly
+            # N(mu * h, sigma * sqrt(h)): sample the standardised horizon
+            # total. The draws are importance-sampled around the target
+            # quantile z and reweighted by the likelihood ratio
+            # phi(u) / phi(u - z): half of them fall beyond the quantile
+            # rather than alpha of them, so fewer draws are needed.
+            z = _z_score(alpha)
+            u = rng.standard_normal(_MC_SIMULATIONS)
+            u += z
+            u.sort()
+            cdf = np.cumsum(np.exp(0.5 * z * z - z * u)) / _MC_SIMULATIONS
+            k = min(int(np.searchsorted(cdf, alpha)), _MC_SIMULATIONS - 1)
+            return float(mu * time_horizon + sigma * np.sqrt(time_horizon) * u[k])
         raise ValueError(f"Unknown VaR method: {method!r}")
 
     @staticmethod
     def calculate_cvar(returns: np.ndarray, alpha: float = 0.05) -> float:
         """Expected Shortfall (CVaR)."""
-        var = np.percentile(returns, alpha * 100)
-        tail = returns[returns <= var]
-        return float(np.mean(tail)) if len(tail) > 0 else float(var)
+        var = float(np.percentile(returns, alpha * 100))
+        return float(_tail_mean(returns, var))
 
     @staticmethod
     def calculate_metrics(
@@ -57,46 +214,47 @@ class RiskManagementService:
         risk_free_rate: float = 0.02,
     ) -> Dict[str, float]:
         """Annualised risk/return metrics for a return series."""
-        ann_ret = float(np.mean(returns) * 252)
-        ann_vol = float(np.std(returns) * np.sqrt(252))
-        excess = returns - risk_free_rate / 252
+        # All moments, the downside deviation and the drawdown in one pass;
+        # mean(returns - rf) is mean(returns) - rf, so the excess series is
+        # never materialised.
+        mean_r, std_r, skew, kurt, down_std, max_dd = _return_stats(returns)
+        ann_ret = float(mean_r * 252)
+        ann_vol = float(std_r * _SQRT_252)
         sharpe = (
-            float(np.mean(excess) / np.std(returns) * np.sqrt(252))
-            if np.std(returns) > 0
+            float((mean_r - risk_free_rate / 252) / std_r * _SQRT_252)
+            if std_r > 0
             else 0.0
         )
-        down = returns[returns < 0]
-        down_dev = float(np.std(down) * np.sqrt(252)) if len(down) > 0 else 0.0
+        down_dev = float(down_std * _SQRT_252)
         sortino = float(ann_ret / down_dev) if down_dev > 0 else float("inf")
-        cum = np.cumprod(1 + returns)
-        peak = np.maximum.accumulate(cum)
-        dd = (cum - peak) / np.where(peak != 0, peak, 1)
-        max_dd = float(np.min(dd))
+        # 1-day historical VaR and its shortfall share one percentile.
+        var_95 = float(np.percentile(returns, 5.0))
 
         result: Dict[str, float] = {
             "annualized_return": ann_ret,
             "volatility": ann_vol,
             "sharpe_ratio": sharpe,
             "sortino_ratio": sortino,
-            "max_drawdown": max_dd,
-            "skewness": float(stats.skew(returns)),
-            "kurtosis": float(stats.kurtosis(returns)),
-            "var_95": RiskManagementService.calculate_var(returns, 0.05),
-            "cvar_95": RiskManagementService.calculate_cvar(returns, 0.05),
+            "max_drawdown": float(max_dd),
+            "skewness": float(skew),
+            "kurtosis": float(kurt),
+            "var_95": var_95,
+            "cvar_95": float(_tail_mean(returns, var_95)),
         }
 
         if benchmark_returns is not None and len(benchmark_returns) == len(returns):
-            bench_var = np.var(benchmark_returns)
-            cov = np.cov(returns, benchmark_returns)[0, 1]
-            beta = float(cov / bench_var) if bench_var > 0 else 0.0
-            bench_ann = float(np.mean(benchmark_returns) * 252)
+            mean_b, var_p, bench_var, cov_pb = _co_moments(returns, benchmark_returns)
+            n = len(returns)
+            # Beta keeps its sample covariance over population variance.
+            beta = float(cov_pb * n / (n - 1) / bench_var) if bench_var > 0 else 0.0
+            bench_ann = float(mean_b * 252)
             alpha_capm = ann_ret - (
                 risk_free_rate + beta * (bench_ann - risk_free_rate)
             )
-            corr = float(np.corrcoef(returns, benchmark_returns)[0, 1])
-            active = returns - benchmark_returns
-            te = float(np.std(active) * np.sqrt(252))
-            ir = float(np.mean(active) * 252 / te) if te > 0 else 0.0
+            corr = float(cov_pb / np.sqrt(var_p * bench_var))
+            # var(p - b) = var(p) + var(b) - 2 cov(p, b)
+            te = float(np.sqrt(max(var_p + bench_var - 2 * cov_pb, 0.0)) * _SQRT_252)
+            ir = float((mean_r - mean_b) * 252 / te) if te > 0 else 0.0
             result.update(
                 {
                     "beta": beta,
@@ -123,21 +281,29 @@ class RiskManagementService:
             scenarios: List of dicts with keys 'name', 'asset_shocks' (dict),
                        and optional 'market_shock' (scalar fallback shock).
         """
-        results = []
-        for scenario in scenarios:
-            name = scenario.get("name", "Unnamed")
-            asset_shocks = scenario.get("asset_shocks", {})
-            market_shock = scenario.get("market_shock", 0.0)
-
-            stressed = 0.0
-            for symbol, weight in weights.items():
-                shock = asset_shocks.get(symbol, market_shock)
-                stressed += current_value * weight * (1 + shock)
+        index = {s: i for i, s in enumerate(weights)}
+        exposure = current_value * np.fromiter(
+            weights.values(), dtype=np.float64, count=len(index)
+        )
+        # One (scenarios x assets) shock matrix: each row starts at the
+        # scenario's market shock and its asset-specific overrides are
+        # scattered in, so every stressed value comes from one product.
+        shocks = np.empty((len(scenarios), len(index)))
+        for row, scenario in zip(shocks, scenarios):
+            row.fill(scenario.get("market_shock", 0.0))
+            for symbol, shock in scenario.get("asset_shocks", {}).items():
+                i = index.get(symbol)
+                if i is not None:
+                    row[i] = shock
+        shocks += 1.0
+        stressed_values = (shocks @ exposure).tolist()
 
+        results = []
+        for scenario, stressed in zip(scenarios, stressed_values):
             impact = stressed - current_value
             results.append(
                 {
-                    "scenario_name": name,
+                    "scenario_name": scenario.get("name", "Unnamed"),
                     "current_value": current_value,
                     "stressed_value": stressed,
                     "absolute_impact": impact,
@@ -151,19 +317,21 @@ class RiskManagementService:
     @staticmethod
     def concentration_risk(weights: List[float]) -> Dict[str, Any]:
         """Herfindahl-Hirschman Index and related concentration metrics."""
-        if not weights or sum(weights) == 0:
+        w = np.asarray(weights, dtype=np.float64)
+        total = w.sum()
+        if w.size == 0 or total == 0:
             return {"error": "Empty or zero-sum weights"}
-        w = np.array(weights) / sum(weights)
-        hhi = float(np.sum(w**2))
+        w = w / total
+        hhi = float(w @ w)
         eff_n = 1 / hhi if hhi > 0 else 0
-        sorted_w = sorted(w, reverse=True)
-        top5 = float(sum(sorted_w[:5]))
+        # Only the five largest weights are needed: select, don't sort.
+        top5 = float(np.partition(w, -5)[-5:].sum() if w.size > 5 else w.sum())
         level = "High" if hhi > 0.25 else ("Medium" if hhi > 0.15 else "Low")
         return {
             "herfindahl_index": hhi,
             "effective_number_of_holdings": eff_n,
             "top_5_concentration": top5,
-            "largest_holding_weight": float(max(w)),
+            "largest_holding_weight": float(w.max()),
             "concentration_level": level,
             "total_holdings": len(weights),
         }
@@ -8,9 +8,29 @@ from typing import Any, Dict, Optional
 
 
 def _engine_options(db_url: str) -> Dict[str, Any]:
+    # Room for every distinct ORM statement shape so none is recompiled.
+    options: Dict[str, Any] = {"query_cache_size": 1200}
     if db_url.startswith("sqlite"):
-        return {}
-    return {"pool_size": 10, "pool_recycle": 120, "pool_pre_ping": True}
+        return options
+    # Behind PgBouncer (transaction mode) it does the pooling; keep ours small
+    # rather than stacking a second full-size pool on top.
+    behind_pgbouncer = os.environ.get("DB_PGBOUNCER", "").lower() in ("1", "true")
+    options.update(
+        {
+            "pool_size": int(
+                os.environ.get("DB_POOL_SIZE", "5" if behind_pgbouncer else "20")
+            ),
+            "max_overflow": int(
+                os.environ.get("DB_MAX_OVERFLOW", "5" if behind_pgbouncer else "30")
+            ),
+            "pool_recycle": 1800,
+            "pool_pre_ping": True,
+            # Reuse the most recently returned connection so idle ones can
+            # time out instead of every connection being kept warm.
+            "pool_use_lifo": True,
+        }
+    )
+    return options
 
 
 class Config:
@@ -21,7 +41,7 @@ class Config:
         "DATABASE_URL", "sqlite:///quantumvest.db"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
-    SQLALCHEMY_ENGINE_OPTIONS: Dict[str, Any] = {}
+    SQLALCHEMY_ENGINE_OPTIONS: Dict[str, Any] = _engine_options(SQLALCHEMY_DATABASE_URI)
 
     JWT_SECRET_KEY: str = os.environ.get("JWT_SECRET_KEY", SECRET_KEY)
     JWT_ACCESS_TOKEN_EXPIRES: timedelta = timedelta(hours=24)
@@ -57,6 +77,7 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI: str = os.environ.get(
         "DEV_DATABASE_URL", "sqlite:///quantumvest_dev.db"
     )
+    SQLALCHEMY_ENGINE_OPTIONS: Dict[str, Any] = _engine_options(SQLALCHEMY_DATABASE_URI)
     BCRYPT_LOG_ROUNDS: int = 4
 
 
@@ -64,9 +85,12 @@ class TestingConfig(Config):
     TESTING: bool = True
     DEBUG: bool = True
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS: Dict[str, Any] = _engine_options(SQLALCHEMY_DATABASE_URI)
     WTF_CSRF_ENABLED: bool = False
     BCRYPT_LOG_ROUNDS: int = 4
     API_RATE_LIMIT: Optional[str] = None
+    # Tables are recreated per test, so cached ids/prices would go stale.
+    CACHE_TYPE: str = "NullCache"
 
 
 class ProductionConfig(Config):
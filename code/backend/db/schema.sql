@@ -1,10 +1,13 @@
 -- QuantumVest reference schema (auto-managed by Flask-Migrate in practice)
 
+-- gen_random_uuid() for primary-key defaults (built in from PostgreSQL 13)
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
 CREATE TABLE IF NOT EXISTS users (
     id          VARCHAR(36) PRIMARY KEY,
     email       VARCHAR(255) UNIQUE NOT NULL,
     username    VARCHAR(80)  UNIQUE NOT NULL,
-    password_hash VARCHAR(255) NOT NULL,
+    password_hash VARCHAR(192) NOT NULL,
     first_name  VARCHAR(100),
     last_name   VARCHAR(100),
     role        VARCHAR(30)  NOT NULL DEFAULT 'client',
@@ -39,10 +42,10 @@ CREATE TABLE IF NOT EXISTS portfolios (
     currency        VARCHAR(10)  DEFAULT 'USD',
     is_default      BOOLEAN NOT NULL DEFAULT FALSE,
     risk_level      VARCHAR(30)  DEFAULT 'moderate',
-    total_value     NUMERIC(20,2) DEFAULT 0,
+    total_value     DOUBLE PRECISION DEFAULT 0,
     cash_balance    NUMERIC(20,2) DEFAULT 0,
     realized_pnl    NUMERIC(20,2) DEFAULT 0,
-    unrealized_pnl  NUMERIC(20,2) DEFAULT 0,
+    unrealized_pnl  DOUBLE PRECISION DEFAULT 0,
     is_active       BOOLEAN NOT NULL DEFAULT TRUE,
     created_at      TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
@@ -53,17 +56,19 @@ CREATE TABLE IF NOT EXISTS portfolio_holdings (
     asset_id        VARCHAR(36) NOT NULL REFERENCES assets(id),
     quantity        NUMERIC(20,8) NOT NULL DEFAULT 0,
     average_cost    NUMERIC(15,8) NOT NULL DEFAULT 0,
-    current_price   NUMERIC(15,8),
-    market_value    NUMERIC(20,2) DEFAULT 0,
-    unrealized_pnl  NUMERIC(20,2) DEFAULT 0,
+    current_price   DOUBLE PRECISION,
+    market_value    DOUBLE PRECISION DEFAULT 0,
+    unrealized_pnl  DOUBLE PRECISION DEFAULT 0,
     weight          FLOAT DEFAULT 0,
     UNIQUE(portfolio_id, asset_id),
     CHECK(quantity >= 0),
     CHECK(average_cost >= 0)
 );
 
+-- Range-partitioned by month on executed_at; the partition key must be part
+-- of the primary key. Monthly partitions are created by the application.
 CREATE TABLE IF NOT EXISTS transactions (
-    id               VARCHAR(36) PRIMARY KEY,
+    id               VARCHAR(36) NOT NULL,
     user_id          VARCHAR(36) NOT NULL REFERENCES users(id),
     portfolio_id     VARCHAR(36) NOT NULL REFERENCES portfolios(id),
     asset_id         VARCHAR(36) NOT NULL REFERENCES assets(id),
@@ -75,7 +80,10 @@ CREATE TABLE IF NOT EXISTS transactions (
     realized_pnl     NUMERIC(20,2) DEFAULT 0,
     executed_at      TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
     created_at       TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (id, executed_at),
     CHECK(quantity > 0),
     CHECK(price >= 0),
     CHECK(fees >= 0)
-);
+) PARTITION BY RANGE (executed_at);
+
+CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT;
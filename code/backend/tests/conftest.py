@@ -22,6 +22,8 @@ def app():
 @pytest.fixture(scope="function")
 def db(app):
     """Function-scoped DB — fresh tables per test."""
+    # create_app seeds the default assets; start every test from empty tables.
+    _db.drop_all()
     _db.create_all()
     yield _db
     _db.session.remove()
@@ -0,0 +1,137 @@
+"""Unit tests for the maintenance CLI commands."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from app.models.base import MONTHLY_PARTITIONED_TABLES, roll_monthly_partitions
+from app.models.financial import (
+    AssetLatestPrice,
+    Portfolio,
+    PortfolioHolding,
+    PriceData,
+)
+
+
+class TestRefreshValuations:
+    def test_stored_valuations_follow_latest_close(
+        self, app, db, sample_portfolio, sample_asset
+    ):
+        now = datetime.now(timezone.utc)
+        db.session.add(
+            PortfolioHolding(
+                portfolio_id=sample_portfolio.id,
+                asset_id=sample_asset.id,
+                quantity=10,
+                average_cost=100,
+                market_value=0,
+            )
+        )
+        db.session.add(
+            PriceData(
+                asset_id=sample_asset.id,
+                timestamp=now - timedelta(days=1),
+                open_price=120,
+                high_price=120,
+                low_price=120,
+                close_price=120,
+            )
+        )
+        db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=["refresh-valuations"])
+        assert result.exit_code == 0, result.output
+        assert "Refreshed 1 portfolio(s)" in result.output
+
+        db.session.expire_all()
+        holding = PortfolioHolding.query.filter_by(
+            portfolio_id=sample_portfolio.id
+        ).one()
+        assert float(holding.market_value) == pytest.approx(1200.0)
+        assert float(db.session.get(Portfolio, sample_portfolio.id).total_value) == (
+            pytest.approx(1200.0)
+        )
+
+
+class TestRebuildLatestPrices:
+    def test_rebuilds_and_commits(self, app, db, monkeypatch):
+        sessions = []
+        monkeypatch.setattr(
+            AssetLatestPrice, "rebuild", classmethod(lambda cls, s: sessions.append(s))
+        )
+        result = app.test_cli_runner().invoke(args=["rebuild-latest-prices"])
+        assert result.exit_code == 0, result.output
+        assert "Rebuilt latest prices" in result.output
+        assert sessions == [db.session]
+
+
+class _RecordingConnection:
+    """PostgreSQL stand-in: records DDL, reports DEFAULT rows for one table."""
+
+    dialect = SimpleNamespace(name="postgresql")
+
+    def __init__(self, stranded):
+        self.stranded = stranded
+        self.statements = []
+
+    def execute(self, statement):
+        sql = str(statement)
+        self.statements.append(sql)
+        months = [
+            month
+            for table, month in self.stranded
+            if sql.startswith("SELECT DISTINCT") and f"FROM {table}_default" in sql
+        ]
+        return SimpleNamespace(scalars=lambda: months)
+
+
+class TestRollPartitions:
+    def test_partitioned_tables_registered(self):
+        assert MONTHLY_PARTITIONED_TABLES["transactions"] == "executed_at"
+        assert MONTHLY_PARTITIONED_TABLES["alerts"] == "created_at"
+        assert MONTHLY_PARTITIONED_TABLES["audit_logs"] == "created_at"
+
+    def test_default_rows_moved_into_their_month(self):
+        connection = _RecordingConnection([("transactions", datetime(2021, 5, 1))])
+        rolled = roll_monthly_partitions(connection)
+        assert rolled == list(MONTHLY_PARTITIONED_TABLES)
+
+        start = next(
+            i
+            for i, sql in enumerate(connection.statements)
+            if sql.startswith("CREATE TABLE transactions_2021_05 (LIKE")
+        )
+        _, insert, delete, attach = connection.statements[start : start + 4]
+        in_month = (
+            "\"executed_at\" >= '2021-05-01T00:00:00+00:00' "
+            "AND \"executed_at\" < '2021-06-01T00:00:00+00:00'"
+        )
+        assert insert == (
+            "INSERT INTO transactions_2021_05 SELECT * FROM transactions_default "
+            f"WHERE {in_month}"
+        )
+        assert delete == f"DELETE FROM transactions_default WHERE {in_month}"
+        assert attach == (
+            "ALTER TABLE transactions ATTACH PARTITION transactions_2021_05 FOR "
+            "VALUES FROM ('2021-05-01T00:00:00+00:00') "
+            "TO ('2021-06-01T00:00:00+00:00')"
+        )
+        assert not any("alerts_2021_05" in s for s in connection.statements)
+
+    def test_months_back_creates_history_partitions(self):
+        connection = _RecordingConnection([])
+        roll_monthly_partitions(connection, months_ahead=0, months_back=2)
+
+        now = datetime.now(timezone.utc)
+        created = [
+            s.split()[5]
+            for s in connection.statements
+            if s.startswith("CREATE TABLE IF NOT EXISTS price_data_2")
+        ]
+        assert len(created) == 3
+        assert created[-1] == f"price_data_{now:%Y_%m}"
+
+    def test_noop_off_postgresql(self, app, db):
+        result = app.test_cli_runner().invoke(args=["roll-partitions"])
+        assert result.exit_code == 0, result.output
+        assert "Rolled partitions for 0 table(s)" in result.output
@@ -0,0 +1,46 @@
+"""Single-pass kernels agree with their NumPy versions.
+
+Each kernel is checked as plain Python and as selected at import time, which
+is the numba-compiled build whenever numba is installed.
+"""
+
+import numpy as np
+import pytest
+from app.services import portfolio, risk
+
+
+def _returns(seed, n=500):
+    return np.random.default_rng(seed).normal(0.0005, 0.02, n)
+
+
+def _tail_mean_args():
+    ret = _returns(1)
+    return ret, float(np.percentile(ret, 5))
+
+
+def _co_moment_args():
+    p = _returns(4, 400)
+    return p, 0.6 * p + _returns(5, 400)
+
+
+def _performance_args():
+    return 100 * np.cumprod(1 + _returns(3, 120)), 0.02 / 252
+
+
+KERNELS = {
+    "tail_mean": (risk, "_tail_mean", _tail_mean_args),
+    "return_stats": (risk, "_return_stats", lambda: (_returns(2),)),
+    "co_moments": (risk, "_co_moments", _co_moment_args),
+    "performance": (portfolio, "_performance_kernel", _performance_args),
+}
+
+
+class TestKernels:
+    @pytest.mark.parametrize("name", sorted(KERNELS))
+    @pytest.mark.parametrize("variant", ["_loop", ""])
+    def test_matches_numpy(self, name, variant):
+        module, prefix, make_args = KERNELS[name]
+        args = make_args()
+        expected = getattr(module, f"{prefix}_numpy")(*args)
+        actual = getattr(module, f"{prefix}{variant}")(*args)
+        np.testing.assert_allclose(actual, expected, rtol=1e-9)
@@ -1,15 +1,26 @@
 """Unit tests for ORM models."""
 
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
 import pytest
 from app.models.financial import (
     Asset,
+    AssetLatestPrice,
     AssetType,
+    Portfolio,
+    PortfolioHolding,
+    PriceData,
+    PriceHistory,
     RiskLevel,
+    RiskMetrics,
     Transaction,
     TransactionType,
     User,
     UserRole,
+    _upsert_many,
 )
+from werkzeug.security import generate_password_hash
 
 
 class TestUserModel:
@@ -21,6 +32,29 @@ class TestUserModel:
         assert test_user.check_password("TestPassword123")
         assert not test_user.check_password("wrongpassword")
 
+    def test_repeat_check_password_uses_cache(self, db, test_user, monkeypatch):
+        assert test_user.check_password("TestPassword123")
+
+        def _fail(*_args, **_kwargs):
+            raise AssertionError("KDF should not run for a cached success")
+
+        monkeypatch.setattr("app.models.financial.check_password_hash", _fail)
+        assert test_user.check_password("TestPassword123")
+
+    def test_set_password_invalidates_cache(self, db, test_user):
+        assert test_user.check_password("TestPassword123")
+        test_user.set_password("NewPassword456")
+        assert not test_user.check_password("TestPassword123")
+        assert test_user.check_password("NewPassword456")
+
+    def test_legacy_hash_upgraded_on_check(self, db, test_user):
+        pytest.importorskip("argon2")
+        test_user.password_hash = generate_password_hash("LegacyPass123")
+        assert test_user.check_password("LegacyPass123")
+        assert test_user.password_hash.startswith("$argon2")
+        assert test_user.check_password("LegacyPass123")
+        assert not test_user.check_password("wrongpassword")
+
     def test_to_dict_excludes_password(self, db, test_user):
         d = test_user.to_dict()
         assert "password_hash" not in d
@@ -73,6 +107,15 @@ class TestAssetModel:
         assert btc.asset_type == AssetType.CRYPTO
         assert btc.to_dict()["asset_type"] == "crypto"
 
+    def test_resolve_symbols(self, db, sample_asset):
+        ids = Asset.resolve(db.session, ["AAPL", "ZZZZ", "AAPL"])
+        assert ids == {"AAPL": sample_asset.id}
+
+    def test_fetch_by_symbols(self, db, sample_asset):
+        assets = Asset.fetch_by_symbols(["AAPL", "ZZZZ"])
+        assert list(assets) == ["AAPL"]
+        assert assets["AAPL"].id == sample_asset.id
+
 
 class TestPortfolioModel:
     def test_create_portfolio(self, db, sample_portfolio, test_user):
@@ -95,6 +138,45 @@ class TestPortfolioModel:
     def test_cash_balance_default(self, db, sample_portfolio):
         assert float(sample_portfolio.cash_balance) == 0.0
 
+    def test_refresh_valuation_uses_latest_price(
+        self, db, sample_portfolio, sample_asset
+    ):
+        now = datetime.now(timezone.utc)
+        db.session.add(
+            PortfolioHolding(
+                portfolio_id=sample_portfolio.id,
+                asset_id=sample_asset.id,
+                quantity=10,
+                average_cost=100,
+            )
+        )
+        for days_ago, close in ((2, 110), (1, 120)):
+            db.session.add(
+                PriceData(
+                    asset_id=sample_asset.id,
+                    timestamp=now - timedelta(days=days_ago),
+                    open_price=close,
+                    high_price=close,
+                    low_price=close,
+                    close_price=close,
+                )
+            )
+        db.session.commit()
+
+        Portfolio.refresh_valuation(db.session, sample_portfolio.id)
+        db.session.commit()
+        db.session.expire_all()
+
+        holding = PortfolioHolding.query.filter_by(
+            portfolio_id=sample_portfolio.id
+        ).one()
+        assert float(holding.current_price) == pytest.approx(120.0)
+        assert float(holding.market_value) == pytest.approx(1200.0)
+        assert float(holding.unrealized_pnl) == pytest.approx(200.0)
+        assert float(db.session.get(Portfolio, sample_portfolio.id).total_value) == (
+            pytest.approx(1200.0)
+        )
+
 
 class TestTransactionModel:
     def test_create_transaction(self, db, test_user, sample_portfolio, sample_asset):
@@ -130,3 +212,141 @@ class TestTransactionModel:
         d = tx.to_dict()
         assert d["transaction_type"] == "sell"
         assert d["quantity"] == 5.0
+
+    def test_page_dicts_newest_first(
+        self, db, test_user, sample_portfolio, sample_asset
+    ):
+        now = datetime.now(timezone.utc)
+        for days_ago in (2, 1):
+            db.session.add(
+                Transaction(
+                    user_id=test_user.id,
+                    portfolio_id=sample_portfolio.id,
+                    asset_id=sample_asset.id,
+                    transaction_type=TransactionType.BUY,
+                    quantity=days_ago,
+                    price=100.0,
+                    total_amount=100.0 * days_ago,
+                    executed_at=now - timedelta(days=days_ago),
+                )
+            )
+        db.session.commit()
+
+        page = Transaction.page_dicts(db.session, sample_portfolio.id, limit=1)
+        assert len(page) == 1
+        assert page[0]["quantity"] == 1.0
+        assert page[0]["transaction_type"] == "buy"
+
+
+class TestPriceHistoryModel:
+    def test_upsert_many_overwrites_existing_bar(self, db, sample_asset):
+        ts = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        bar = {
+            "asset_id": sample_asset.id,
+            "timestamp": ts,
+            "open_price": 100,
+            "high_price": 105,
+            "low_price": 99,
+            "close_price": 101,
+        }
+        assert PriceHistory.upsert_many(db.session, [bar]) == 1
+        PriceHistory.upsert_many(db.session, [{**bar, "close_price": 104}])
+        db.session.commit()
+
+        rows = PriceHistory.query.filter_by(asset_id=sample_asset.id).all()
+        assert len(rows) == 1
+        assert float(rows[0].close_price) == pytest.approx(104.0)
+        assert rows[0].source == "api"
+
+    def test_bulk_load_inserts_rows(self, db, sample_asset):
+        start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        bars = [
+            {
+                "asset_id": sample_asset.id,
+                "timestamp": start + timedelta(days=i),
+                "open_price": 100 + i,
+                "high_price": 101 + i,
+                "low_price": 99 + i,
+                "close_price": 100 + i,
+            }
+            for i in range(3)
+        ]
+        assert PriceHistory.bulk_load(db.session, bars) == 3
+        assert PriceHistory.bulk_load(db.session, []) == 0
+        db.session.commit()
+
+        assert PriceHistory.query.filter_by(asset_id=sample_asset.id).count() == 3
+
+
+class TestPriceDataModel:
+    def _bar(self, asset_id, close=100):
+        return {
+            "asset_id": asset_id,
+            "timestamp": datetime(2024, 1, 2, tzinfo=timezone.utc),
+            "interval": "1d",
+            "open_price": close,
+            "high_price": close,
+            "low_price": close,
+            "close_price": close,
+        }
+
+    def test_duplicate_bar_rejected_by_unique_index(self, db, sample_asset):
+        db.session.add(PriceData(**self._bar(sample_asset.id)))
+        db.session.commit()
+        db.session.add(PriceData(**self._bar(sample_asset.id)))
+        with pytest.raises(Exception):
+            db.session.commit()
+        db.session.rollback()
+
+    def test_upsert_conflict_targets_unique_index(self, db, sample_asset):
+        key = ("asset_id", "timestamp", "interval")
+        _upsert_many(db.session, PriceData, [self._bar(sample_asset.id)], key)
+        _upsert_many(db.session, PriceData, [self._bar(sample_asset.id, 104)], key)
+        db.session.commit()
+
+        rows = PriceData.query.filter_by(asset_id=sample_asset.id).all()
+        assert len(rows) == 1
+        assert rows[0].close_price == pytest.approx(104.0)
+
+
+class TestAssetLatestPrice:
+    def test_lookup_returns_newest_close(self, db, sample_asset):
+        now = datetime.now(timezone.utc)
+        for days_ago, close in ((2, 110), (1, 120)):
+            db.session.add(
+                PriceData(
+                    asset_id=sample_asset.id,
+                    timestamp=now - timedelta(days=days_ago),
+                    open_price=close,
+                    high_price=close,
+                    low_price=close,
+                    close_price=close,
+                )
+            )
+        db.session.commit()
+
+        prices = AssetLatestPrice.lookup(db.session, [sample_asset.id])
+        assert prices == {sample_asset.id: pytest.approx(120.0)}
+        assert AssetLatestPrice.lookup(db.session, []) == {}
+
+    def test_rebuild_is_noop_off_postgresql(self, db):
+        AssetLatestPrice.rebuild(db.session)
+        assert AssetLatestPrice.query.count() == 0
+
+
+class TestRiskMetricsModel:
+    def test_correlation_matrix_round_trip(self, db, sample_portfolio):
+        corr = np.array([[1.0, 0.25], [0.25, 1.0]])
+        rm = RiskMetrics(
+            portfolio_id=sample_portfolio.id,
+            calculation_date=datetime.now(timezone.utc),
+        )
+        rm.set_correlation_matrix(corr)
+        rm.set_stress_test_results([{"scenario_name": "Crash", "impact": -0.2}])
+        db.session.add(rm)
+        db.session.commit()
+        db.session.expire_all()
+
+        stored = db.session.get(RiskMetrics, rm.id)
+        np.testing.assert_allclose(stored.get_correlation_matrix(), corr)
+        assert stored.get_stress_test_results()[0]["scenario_name"] == "Crash"
@@ -0,0 +1,142 @@
+"""Unit tests for portfolio service helpers."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from app.extensions import cache
+from app.models.financial import Asset, AssetType, PriceData
+from app.services import portfolio
+from app.services.portfolio import (
+    _LATEST_PRICE_KEY,
+    PortfolioService,
+    _min_variance,
+    _min_variance_closed_form,
+    _min_variance_pg_loop,
+    _min_variance_slsqp,
+    _performance_kernel,
+)
+
+
+class TestPerformanceKernel:
+    def test_drawdown_of_falling_series(self):
+        values = np.array([100.0, 90.0, 95.0, 80.0])
+        _, _, max_drawdown = _performance_kernel(values, 0.0)
+        assert max_drawdown == pytest.approx(-20.0)
+
+
+class TestMinVariance:
+    def test_projected_gradient_matches_slsqp(self):
+        np.random.seed(7)
+        returns = np.random.normal(0, 0.01, (250, 5)) * [1, 2, 3, 1.5, 0.5]
+        cov = np.cov(returns, rowvar=False) * 252
+        expected, _, status = _min_variance_slsqp(cov)
+        assert status == "optimal"
+        weights, converged = _min_variance_pg_loop(cov, 5000, 1e-10)
+        assert converged
+        assert weights.sum() == pytest.approx(1.0)
+        assert weights.min() >= 0.0
+        np.testing.assert_allclose(weights, expected, atol=1e-3)
+
+    def test_closed_form_when_unconstrained_optimum_is_long_only(self):
+        cov = np.diag([0.04, 0.01])
+        np.testing.assert_allclose(_min_variance_closed_form(cov), [0.2, 0.8])
+
+    def test_closed_form_declines_short_positions(self):
+        cov = np.array([[0.01, 0.018], [0.018, 0.04]])
+        assert _min_variance_closed_form(cov) is None
+
+    def test_unconverged_kernel_is_not_reported_optimal(self, monkeypatch):
+        # Eigenvalues spanning eight decades: the closed form goes short and
+        # 5000 projected-gradient steps do not settle.
+        q, _ = np.linalg.qr(np.random.default_rng(0).normal(size=(6, 6)))
+        cov = q @ np.diag(np.logspace(0, -8, 6)) @ q.T
+        assert _min_variance_closed_form(cov) is None
+        _, converged = _min_variance_pg_loop(cov, 5000, 1e-10)
+        assert not converged
+
+        monkeypatch.setattr(portfolio, "_min_variance_pg", _min_variance_pg_loop)
+        weights, variance, status = _min_variance(cov)
+        assert status != "optimal"
+        assert weights.sum() == pytest.approx(1.0)
+        assert variance <= _min_variance_slsqp(cov)[1]
+
+
+def _price(asset_id, days_ago, close):
+    return PriceData(
+        asset_id=asset_id,
+        timestamp=datetime.now(timezone.utc) - timedelta(days=days_ago),
+        open_price=close,
+        high_price=close,
+        low_price=close,
+        close_price=close,
+    )
+
+
+class TestLatestPriceCache:
+    @pytest.fixture(autouse=True)
+    def simple_cache(self, app):
+        # TestingConfig uses NullCache; exercise a real backend here.
+        cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+        yield
+        cache.init_app(app, config={"CACHE_TYPE": "NullCache"})
+
+    def test_cached_close_evicted_by_new_price(self, db, sample_asset):
+        key = _LATEST_PRICE_KEY.format(sample_asset.id)
+        db.session.add(_price(sample_asset.id, 2, 120))
+        db.session.commit()
+
+        prices = PortfolioService._get_latest_prices_bulk([sample_asset.id])
+        assert prices == {sample_asset.id: pytest.approx(120.0)}
+        assert cache.get(key) == pytest.approx(120.0)
+
+        db.session.add(_price(sample_asset.id, 1, 130))
+        db.session.commit()
+        assert cache.get(key) is None
+        prices = PortfolioService._get_latest_prices_bulk([sample_asset.id])
+        assert prices == {sample_asset.id: pytest.approx(130.0)}
+
+    def test_one_eviction_per_flush(self, db, sample_asset, monkeypatch):
+        calls = []
+        monkeypatch.setattr(cache, "delete_many", lambda *keys: calls.append(keys))
+        db.session.add_all(_price(sample_asset.id, d, 100 + d) for d in range(1, 6))
+        db.session.commit()
+        assert calls == [(_LATEST_PRICE_KEY.format(sample_asset.id),)]
+
+
+class TestAssetReturns:
+    def test_mismatched_calendars_keep_monday_returns(self, db, sample_asset):
+        btc = Asset(symbol="BTC", name="Bitcoin", asset_type=AssetType.CRYPTO)
+        db.session.add(btc)
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        days = [today - timedelta(days=d) for d in range(21, 0, -1)]
+        for i, ts in enumerate(days):
+            bars = [(btc, 100.0 + i)]
+            if ts.weekday() < 5:
+                bars.append((sample_asset, 50.0 + i))
+            for asset, close in bars:
+                db.session.add(
+                    PriceData(
+                        asset=asset,
+                        timestamp=ts,
+                        open_price=close,
+                        high_price=close,
+                        low_price=close,
+                        close_price=close,
+                    )
+                )
+        db.session.commit()
+
+        returns = PortfolioService._get_asset_returns_bulk([sample_asset.id, btc.id])
+
+        weekdays = [i for i, ts in enumerate(days) if ts.weekday() < 5]
+        assert len(returns) == len(weekdays) - 1
+        assert not returns.isna().any().any()
+        monday = next(i for i in weekdays[1:] if days[i].weekday() == 0)
+        row = returns.loc[returns.index.day == days[monday].day].iloc[0]
+        assert row[sample_asset.id] == pytest.approx(
+            (50.0 + monday) / (47.0 + monday) - 1
+        )
+        assert row[btc.id] == pytest.approx((100.0 + monday) / (99.0 + monday) - 1)
@@ -2,7 +2,13 @@
 
 import numpy as np
 import pytest
-from app.services.risk import RiskManagementService
+from app.services.risk import (
+    RiskManagementService,
+    _return_stats,
+    _tail_mean,
+    _z_score,
+)
+from scipy import stats
 
 
 class TestVaR:
@@ -29,6 +35,16 @@ class TestVaR:
         )
         assert var < 0
 
+    @pytest.mark.parametrize("alpha", [0.05, 0.01])
+    def test_monte_carlo_var_matches_parametric(self, alpha):
+        mc = RiskManagementService.calculate_var(
+            self.ret, alpha=alpha, method="monte_carlo"
+        )
+        parametric = RiskManagementService.calculate_var(
+            self.ret, alpha=alpha, method="parametric"
+        )
+        assert mc == pytest.approx(parametric, abs=0.002)
+
     def test_99_var_worse_than_95(self):
         var95 = RiskManagementService.calculate_var(self.ret, alpha=0.05)
         var99 = RiskManagementService.calculate_var(self.ret, alpha=0.01)
@@ -44,6 +60,28 @@ class TestVaR:
         assert cvar <= var
 
 
+class TestZScore:
+    @pytest.mark.parametrize("alpha", [0.10, 0.05, 0.025, 0.01, 0.2])
+    def test_matches_scipy(self, alpha):
+        assert _z_score(alpha) == pytest.approx(stats.norm.ppf(alpha), rel=1e-12)
+
+
+class TestTailMean:
+    def test_empty_tail_returns_threshold(self):
+        ret = np.array([0.01, 0.02])
+        assert _tail_mean(ret, -0.5) == -0.5
+
+
+class TestReturnStats:
+    def test_moments_match_scipy(self):
+        np.random.seed(3)
+        ret = np.random.normal(0.0, 0.01, 300)
+        _, std, skew, kurt, _, _ = _return_stats(ret)
+        assert std == pytest.approx(np.std(ret), rel=1e-9)
+        assert skew == pytest.approx(stats.skew(ret), rel=1e-9)
+        assert kurt == pytest.approx(stats.kurtosis(ret), rel=1e-9)
+
+
 class TestMetrics:
     @pytest.fixture(autouse=True)
     def data(self):
@@ -99,6 +137,19 @@ class TestStressTest:
         results = RiskManagementService.stress_test(100_000, weights, scenarios)
         assert results[0]["stressed_value"] == pytest.approx(82_000, rel=1e-6)
 
+    def test_multiple_scenarios_keep_order(self):
+        weights = {"AAPL": 0.5, "MSFT": 0.5}
+        scenarios = [
+            {"name": "Flat"},
+            {"name": "Mixed", "asset_shocks": {"MSFT": 0.10, "TSLA": -0.9}},
+            {"name": "Crash", "market_shock": -0.5},
+        ]
+        results = RiskManagementService.stress_test(100_000, weights, scenarios)
+        assert [r["scenario_name"] for r in results] == ["Flat", "Mixed", "Crash"]
+        assert [r["stressed_value"] for r in results] == pytest.approx(
+            [100_000, 105_000, 50_000]
+        )
+
 
 class TestConcentrationRisk:
     def test_uniform_weights(self):
@@ -118,6 +169,11 @@ class TestConcentrationRisk:
         r = RiskManagementService.concentration_risk(w)
         assert r["concentration_level"] == "Low"
 
+    def test_top_5_concentration(self):
+        w = [0.02, 0.3, 0.05, 0.2, 0.03, 0.15, 0.1, 0.15]
+        r = RiskManagementService.concentration_risk(w)
+        assert r["top_5_concentration"] == pytest.approx(0.9, rel=1e-9)
+
     def test_empty_weights(self):
         r = RiskManagementService.concentration_risk([])
         assert "error" in r
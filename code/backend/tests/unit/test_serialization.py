@@ -0,0 +1,29 @@
+"""Unit tests for the orjson-backed Flask JSON provider."""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from app.core.serialization import ORJSONProvider
+from flask.json.provider import DefaultJSONProvider
+
+pytest.importorskip("orjson")
+
+
+class TestORJSONProvider:
+    def test_matches_default_provider(self, app):
+        payload = {
+            "b": Decimal("1.50"),
+            "a": uuid.UUID(int=1),
+            "when": datetime(2024, 1, 2, tzinfo=timezone.utc),
+        }
+        expected = json.loads(DefaultJSONProvider(app).dumps(payload))
+        assert json.loads(ORJSONProvider(app).dumps(payload)) == expected
+
+    def test_numpy_values(self, app):
+        provider = ORJSONProvider(app)
+        out = provider.loads(provider.dumps({"w": np.array([0.5, 0.5])}))
+        assert out == {"w": [0.5, 0.5]}